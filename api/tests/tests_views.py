@@ -0,0 +1,129 @@
+import json
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory, UserFactory
+from pictures.tests.factories import PictureFactory
+from sponsors.tests.factories import SponsorFactory
+from core.tests.media import TemporaryMediaMixin
+
+class ApiTest(TemporaryMediaMixin, TestCase):
+    def get(self, url, status=200, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status)
+        return json.loads(response.content)
+
+    def post(self, days_ago, **kwargs):
+        return PostFactory(author=self.author, published_date=now() - timedelta(days=days_ago), **kwargs)
+
+    def setUp(self):
+        super().setUp()
+        self.author = UserFactory()
+        self.url = reverse("api_post_list")
+
+    def test_posts(self):
+        """published posts are listed oldest first with the default fields"""
+        second, first = self.post(1), self.post(2)
+        PostFactory(author=self.author)
+        data = self.get(self.url)
+        self.assertEqual([post["id"] for post in data["results"]], [first.pk, second.pk])
+        self.assertEqual(set(data["results"][0]), {"id", "title", "author", "excerpt", "published_date", "url"})
+        self.assertIsNone(data["next"])
+
+    @override_settings(API_PAGE_SIZE=2)
+    def test_cursor(self):
+        """the next link continues after the last post of the page"""
+        posts = [self.post(days) for days in (5, 4, 3, 2, 1)]
+        data = self.get(self.url)
+        self.assertEqual([post["id"] for post in data["results"]], [p.pk for p in posts[:2]])
+        data = self.get(data["next"])
+        self.assertEqual([post["id"] for post in data["results"]], [p.pk for p in posts[2:4]])
+        data = self.get(data["next"])
+        self.assertEqual([post["id"] for post in data["results"]], [posts[4].pk])
+        self.assertIsNone(data["next"])
+
+    def test_limit(self):
+        """limit sets the page size"""
+        for days in range(3):
+            self.post(days)
+        data = self.get(self.url, limit=1)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertIn("limit=1", data["next"])
+
+    def test_fields(self):
+        """only the requested fields are returned and loaded"""
+        self.post(1, title="hello", text="long body")
+        with self.assertNumQueries(1) as queries:
+            data = self.get(self.url, fields="id,title")
+        self.assertEqual(data["results"][0].keys(), {"id", "title"})
+        self.assertNotIn('"text"', queries.captured_queries[0]["sql"])
+
+    def test_unknown_field(self):
+        """an unknown field is a bad request"""
+        data = self.get(self.url, status=400, fields="id,password")
+        self.assertIn("password", data["error"])
+
+    def test_ids(self):
+        """ids fetches several posts in one query, skipping unpublished ones"""
+        one, two = self.post(1), self.post(2)
+        draft = PostFactory(author=self.author)
+        with self.assertNumQueries(1):
+            data = self.get(self.url, ids="%d,%d,%d" % (two.pk, one.pk, draft.pk))
+        self.assertEqual(sorted(post["id"] for post in data["results"]), sorted([one.pk, two.pk]))
+
+    def test_bad_requests(self):
+        """malformed ids and cursors are rejected"""
+        self.get(self.url, status=400, ids="1,x")
+        self.get(self.url, status=400, after="nonsense")
+
+    def test_json(self):
+        """a page is one json body"""
+        response = self.client.get(self.url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_pictures_and_sponsors(self):
+        """pictures and sponsors list their image urls and dimensions"""
+        picture = PictureFactory()
+        SponsorFactory()
+        data = self.get(reverse("api_picture_list"))
+        self.assertEqual(data["results"][0]["id"], picture.pk)
+        self.assertTrue(data["results"][0]["image"].startswith("http://testserver/media/pictures/"))
+        self.assertEqual(data["results"][0]["width"], picture.width)
+        data = self.get(reverse("api_sponsor_list"), fields="id,image")
+        self.assertEqual(len(data["results"]), 1)
+
+    def test_image_fields_one_query(self):
+        """listing only some image fields loads every row in a single query"""
+        for i in range(5):
+            PictureFactory()
+        with self.assertNumQueries(1):
+            data = self.get(reverse("api_picture_list"), fields="id,image")
+        self.assertEqual(len(data["results"]), 5)
+
+class ApiAsgiTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = PostFactory(author=UserFactory(), published_date=now() - timedelta(days=1))
+
+    async def test_under_asgi(self):
+        """the asgi handler sends the whole body without touching the database on the event loop"""
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        path = reverse("api_post_list")
+        await ASGIHandler()({
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+            "root_path": "", "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }, receive, send)
+        self.assertEqual(messages[0]["status"], 200)
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        self.assertEqual([post["id"] for post in json.loads(body)["results"]], [self.post.pk])
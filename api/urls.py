@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('v1/posts/', views.post_list, name='api_post_list'),
+    path('v1/pictures/', views.picture_list, name='api_picture_list'),
+    path('v1/sponsors/', views.sponsor_list, name='api_sponsor_list'),
+]
@@ -0,0 +1,170 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from blog.models import Post
+from core.pagination import InvalidCursor, encode_cursor, keyset_queryset
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+
+class Resource:
+    """A read-only collection: its rows, ordering and selectable fields.
+
+    ``fields`` maps each API field to the model columns it needs and a
+    function ``(obj, request)`` returning its value, so ``?fields=`` can
+    load only those columns.
+    """
+
+    def __init__(self, queryset, ordering, fields, default_fields):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.fields = fields
+        self.default_fields = default_fields
+
+    def columns(self, names):
+        columns = {'pk'} | set(self.ordering)
+        for name in names:
+            columns.update(self.fields[name][0])
+        return columns
+
+    def serialize(self, obj, names, request):
+        return {name: self.fields[name][1](obj, request) for name in names}
+
+
+def _column(name):
+    return [name], lambda obj, request: getattr(obj, name)
+
+
+def _image_url(obj, request):
+    return request.build_absolute_uri(obj.image.url) if obj.image else None
+
+
+IMAGE_FIELDS = {
+    'id': (['pk'], lambda obj, request: obj.pk),
+    'description': _column('description'),
+    'image': (['image'], _image_url),
+    'width': _column('width'),
+    'height': _column('height'),
+    'placeholder_color': _column('placeholder_color'),
+    'updated_at': _column('updated_at'),
+}
+
+RESOURCES = {
+    'posts': Resource(
+        lambda: Post.objects.published(),
+        ('published_date', 'pk'),
+        {
+            'id': (['pk'], lambda obj, request: obj.pk),
+            'title': _column('title'),
+            'excerpt': _column('excerpt'),
+            'excerpt_html': _column('excerpt_html'),
+            'text': _column('text'),
+            'author': (['author_display_name'], lambda obj, request: obj.author_display_name),
+            'published_date': _column('published_date'),
+            'updated_at': _column('updated_at'),
+            'url': (['pk'], lambda obj, request: request.build_absolute_uri(
+                reverse('post_detail', kwargs={'pk': obj.pk}))),
+        },
+        ('id', 'title', 'author', 'excerpt', 'published_date', 'url'),
+    ),
+    'pictures': Resource(
+        lambda: Picture.objects.all(),
+        ('uploaded_at', 'pk'),
+        dict(IMAGE_FIELDS, uploaded_at=_column('uploaded_at')),
+        ('id', 'description', 'image', 'width', 'height', 'placeholder_color'),
+    ),
+    'sponsors': Resource(
+        lambda: Sponsors.objects.all(),
+        ('pk',),
+        IMAGE_FIELDS,
+        ('id', 'description', 'image', 'width', 'height', 'placeholder_color'),
+    ),
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _field_names(request, resource):
+    if 'fields' not in request.GET:
+        return resource.default_fields
+    names = [name for name in request.GET['fields'].split(',') if name]
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown or not names:
+        raise BadRequest('Unknown fields: %s. Available: %s' % (
+            ', '.join(unknown), ', '.join(resource.fields)))
+    return names
+
+
+def _ids(request):
+    try:
+        ids = [int(pk) for pk in request.GET['ids'].split(',') if pk]
+    except ValueError:
+        raise BadRequest('ids must be a comma separated list of integers')
+    if not ids or len(ids) > settings.API_MAX_IDS:
+        raise BadRequest('ids takes 1 to %d ids' % settings.API_MAX_IDS)
+    return ids
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', settings.API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('limit must be an integer')
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def _page(rows, serialize, limit, next_url):
+    """The results and the link to the next page.
+
+    ``rows`` holds at most ``limit + 1`` objects; the extra one only tells
+    that another page follows, and ``next_url(last)`` builds its link.
+    """
+    rows = list(rows)
+    next_link = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_link = next_url(rows[-1])
+    return {'results': [serialize(obj) for obj in rows], 'next': next_link}
+
+
+def _collection(name):
+    resource = RESOURCES[name]
+
+    @require_GET
+    def view(request):
+        try:
+            names = _field_names(request, resource)
+            queryset = resource.queryset().only(*resource.columns(names))
+            if 'ids' in request.GET:
+                #one IN query, unknown or unpublished ids are left out
+                rows = queryset.filter(pk__in=_ids(request)).order_by('pk')
+                limit = None
+            else:
+                limit = _limit(request)
+                rows = keyset_queryset(queryset, request.GET.get('after'), limit, resource.ordering)
+        except (BadRequest, InvalidCursor) as exc:
+            message = 'Invalid cursor' if isinstance(exc, InvalidCursor) else str(exc)
+            return JsonResponse({'error': message}, status=400)
+
+        def next_url(last):
+            query = request.GET.copy()
+            query['after'] = encode_cursor(last, resource.ordering)
+            return request.build_absolute_uri('%s?%s' % (request.path, query.urlencode()))
+
+        def serialize(obj):
+            return resource.serialize(obj, names, request)
+
+        #pages are capped at API_MAX_PAGE_SIZE, so one encoded body is cheaper than
+        #streaming it, and under ASGI nothing is left to query on the event loop
+        return JsonResponse(_page(rows, serialize, limit, next_url))
+    view.__name__ = '%s_list' % name
+    return view
+
+
+post_list = _collection('posts')
+picture_list = _collection('pictures')
+sponsor_list = _collection('sponsors')
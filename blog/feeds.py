@@ -0,0 +1,107 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from core.cache import namespace_version
+from core.conditional import make_etag
+from core.models import ChangeMarker
+from .models import Post
+
+FEED_TITLE = 'TEDxATHS blog'
+
+
+def _latest_posts():
+    posts = Post.objects.published().order_by('-published_date', '-pk')
+    return list(posts[:settings.BLOG_FEED_SIZE])
+
+
+def _atom(request, posts):
+    feed = Atom1Feed(
+        title=FEED_TITLE,
+        link=request.build_absolute_uri(reverse('post_list')),
+        description='',
+        feed_url=request.build_absolute_uri(reverse('post_feed_atom')),
+    )
+    for post in posts:
+        link = request.build_absolute_uri(reverse('post_detail', kwargs={'pk': post.pk}))
+        feed.add_item(
+            title=post.title,
+            link=link,
+            description=post.body_html,
+            unique_id=link,
+            pubdate=post.published_date,
+            author_name=post.author_display_name,
+            updateddate=post.updated_at,
+        )
+    return feed.writeString('utf-8')
+
+
+def _json_feed(request, posts):
+    feed = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': FEED_TITLE,
+        'home_page_url': request.build_absolute_uri(reverse('post_list')),
+        'feed_url': request.build_absolute_uri(reverse('post_feed_json')),
+        'items': [{
+            'id': request.build_absolute_uri(reverse('post_detail', kwargs={'pk': post.pk})),
+            'url': request.build_absolute_uri(reverse('post_detail', kwargs={'pk': post.pk})),
+            'title': post.title,
+            'content_html': post.body_html,
+            'summary': post.excerpt,
+            'authors': [{'name': post.author_display_name}],
+            'date_published': post.published_date.isoformat(),
+            'date_modified': post.updated_at.isoformat(),
+        } for post in posts],
+    }
+    return json.dumps(feed)
+
+
+FORMATS = {
+    'atom': (_atom, 'application/atom+xml; charset=utf-8'),
+    'json': (_json_feed, 'application/feed+json; charset=utf-8'),
+}
+
+
+def _build(request, kind):
+    posts = _latest_posts()
+    serialize, content_type = FORMATS[kind]
+    body = serialize(request, posts)
+    #deleting or unpublishing a post changes the feed without leaving a newer entry in it
+    _, last_modified = ChangeMarker.current('blog')
+    entry = {
+        'etag': make_etag(body),
+        'last_modified': int(last_modified.timestamp()),
+        'content_type': content_type,
+        'body': body,
+    }
+    return entry
+
+
+def feed_view(kind):
+    def view(request):
+        #the key follows the blog's page cache version, so only publishing,
+        #editing or deleting a post regenerates the feed and polling never hits the database
+        key = 'blog:feed:%s:%s:%s' % (kind, request.get_host(), namespace_version('blog'))
+        entry = cache.get(key)
+        if entry is None:
+            entry = _build(request, kind)
+            cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+        etag = quote_etag(entry['etag'])
+        response = get_conditional_response(request, etag=etag, last_modified=entry['last_modified'])
+        if response is None:
+            response = HttpResponse(entry['body'], content_type=entry['content_type'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
+    view.__name__ = 'post_feed_%s' % kind
+    return view
+
+
+post_feed_atom = feed_view('atom')
+post_feed_json = feed_view('json')
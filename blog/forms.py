@@ -6,4 +6,17 @@ class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
-        fields = ('title', 'text',)
\ No newline at end of file
+        fields = ('title', 'text', 'published_date',)
+        labels = {'published_date': 'Publish at'}
+        help_texts = {'published_date': 'Leave empty to publish now, or pick a future time to schedule the post.'}
+        widgets = {
+            'published_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+        }
+
+    def clean_published_date(self):
+        value = self.cleaned_data['published_date']
+        stored = self.instance.published_date
+        #the widget shows minutes only, so an untouched field keeps the stored seconds
+        if value and stored and value == stored.replace(second=0, microsecond=0):
+            return stored
+        return value
\ No newline at end of file
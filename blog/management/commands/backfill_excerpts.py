@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+from core.cache import invalidate
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored excerpt and text hash of every post'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch, count = [], 0
+        posts = Post.objects.only('pk', 'text', *Post.DERIVED_FIELDS)
+        for post in posts.iterator(chunk_size=batch_size):
+            stored = [getattr(post, name) for name in Post.DERIVED_FIELDS]
+            post.update_derived_fields()
+            if [getattr(post, name) for name in Post.DERIVED_FIELDS] == stored:
+                continue
+            #bulk_update skips auto_now and signals; the new updated_at changes the post's ETag
+            post.updated_at = timezone.now()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                count += self.flush(batch)
+        count += self.flush(batch)
+        if count:
+            invalidate('blog')
+        self.stdout.write(self.style.SUCCESS('Updated %d posts' % count))
+
+    def flush(self, batch):
+        Post.objects.bulk_update(batch, [*Post.DERIVED_FIELDS, 'updated_at'])
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5(title, text, tokenize='porter unicode61')",
+    "INSERT INTO blog_post_fts(rowid, title, text) SELECT id, title, text FROM blog_post",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS blog_post_fts"]
+POSTGRES_CREATE = [
+    "CREATE INDEX blog_post_search_idx ON blog_post USING GIN (("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(text, '')), 'B')))",
+]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS blog_post_search_idx"]
+
+
+def run(sqlite, postgres):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        statements = {'sqlite': sqlite, 'postgresql': postgres}.get(vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(SQLITE_CREATE, POSTGRES_CREATE), run(SQLITE_DROP, POSTGRES_DROP)),
+    ]
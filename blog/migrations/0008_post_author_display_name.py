@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_author_display_name(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    for user in User.objects.filter(pk__in=Post.objects.values('author_id')):
+        name = ('%s %s' % (user.first_name, user.last_name)).strip() or user.username
+        Post.objects.filter(author_id=user.pk).update(author_display_name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='author_display_name',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.RunPython(set_author_display_name, migrations.RunPython.noop),
+    ]
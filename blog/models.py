@@ -1,18 +1,129 @@
+import hashlib
+
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.template.defaultfilters import linebreaksbr
 from django.utils import timezone
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(status=Post.PUBLISHED)
+
+    def due(self, now=None):
+        return self.filter(status=Post.SCHEDULED, published_date__lte=now or timezone.now())
+
+
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def author_display_name(user):
+    return user.get_full_name() or user.get_username()
 
 
 class Post(models.Model):
+    DRAFT = 'draft'
+    SCHEDULED = 'scheduled'
+    PUBLISHED = 'published'
+    STATUS_CHOICES = [
+        (DRAFT, 'Draft'),
+        (SCHEDULED, 'Scheduled'),
+        (PUBLISHED, 'Published'),
+    ]
+
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=200, blank=False)
     text = models.TextField()
     created_date = models.DateTimeField(default=timezone.now)
     published_date = models.DateTimeField(blank=True, null=True)
+    #follows published_date on save; publish_scheduled_posts flips scheduled posts when they are due
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=DRAFT, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    #precomputed from text on save so listings never load or filter the body
+    excerpt = models.TextField(blank=True, editable=False)
+    excerpt_html = models.TextField(blank=True, editable=False)
+    text_hash = models.CharField(max_length=40, blank=True, editable=False)
+    #copied from the author on save and kept in sync by blog.signals, so bylines need no join
+    author_display_name = models.CharField(max_length=300, blank=True, editable=False)
+
+    DERIVED_FIELDS = ('excerpt', 'excerpt_html', 'text_hash')
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            #post_list walks (published_date, id) within the published posts and
+            #the scheduler looks up due posts by (status, published_date)
+            models.Index(fields=['status', 'published_date', 'id'], name='blog_post_status_idx'),
+        ]
+
+    def update_status(self):
+        if self.published_date is None:
+            self.status = self.DRAFT
+        elif self.published_date > timezone.now():
+            self.status = self.SCHEDULED
+        else:
+            self.status = self.PUBLISHED
+
+    def update_derived_fields(self):
+        self.excerpt = Truncator(self.text).chars(settings.BLOG_EXCERPT_LENGTH)
+        self.excerpt_html = linebreaksbr(self.excerpt, autoescape=True)
+        self.text_hash = hashlib.sha1(self.text.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'published_date' in update_fields:
+            self.update_status()
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = set(update_fields) | {'status'}
+        if update_fields is None or 'text' in update_fields:
+            self.update_derived_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = set(update_fields) | set(self.DERIVED_FIELDS)
+        if update_fields is None or 'author' in update_fields:
+            self.author_display_name = author_display_name(self.author)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'author_display_name'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def body_cache_key(pk, text_hash):
+        return 'blog:post_body:%s:%s' % (pk, text_hash)
+
+    def render_body(self):
+        html = linebreaksbr(self.text, autoescape=True)
+        cache.set(self.body_cache_key(self.pk, self.text_hash), html, None)
+        return html
+
+    @property
+    def body_html(self):
+        #keyed by content hash, so a stale entry can never be served for edited text
+        html = cache.get(self.body_cache_key(self.pk, self.text_hash))
+        if html is None:
+            html = self.render_body()
+        return mark_safe(html)
 
     def publish(self):
         self.published_date = timezone.now()
         self.save()
 
+    @property
+    def is_published(self):
+        return self.status == self.PUBLISHED
+
+    @classmethod
+    def publish_due(cls, now=None):
+        """Publish every scheduled post whose time has come."""
+        published = 0
+        for post in cls.objects.due(now).defer('text'):
+            post.status = cls.PUBLISHED
+            #saved one by one so caches, feeds and the search index hear about it
+            post.save(update_fields=['status', 'updated_at'])
+            published += 1
+        return published
+
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -0,0 +1,122 @@
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+#both are created by migration 0006_post_search
+FTS_TABLE = 'blog_post_fts'
+PG_INDEX = 'blog_post_search_idx'
+PG_CONFIG = 'english'
+#control characters cannot occur in escaped output, so they mark matches safely
+START, STOP = '\x02', '\x03'
+
+
+def _vendor():
+    return connection.vendor
+
+
+def _pg_vector_sql():
+    #queries must repeat this exact expression for postgres to use the index
+    return (
+        "setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('{config}', coalesce(text, '')), 'B')"
+    ).format(config=PG_CONFIG)
+
+
+def index_post(post):
+    #postgres keeps its expression index up to date by itself
+    if _vendor() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s WHERE rowid = %%s' % FTS_TABLE, [post.pk])
+        cursor.execute('INSERT INTO %s(rowid, title, text) VALUES (%%s, %%s, %%s)' % FTS_TABLE,
+                       [post.pk, post.title, post.text])
+
+
+def unindex_post(pk):
+    if _vendor() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s WHERE rowid = %%s' % FTS_TABLE, [pk])
+
+
+def rebuild():
+    vendor = _vendor()
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute('DELETE FROM %s' % FTS_TABLE)
+            cursor.execute('INSERT INTO %s(rowid, title, text) SELECT id, title, text FROM blog_post' % FTS_TABLE)
+            cursor.execute("INSERT INTO %s(%s) VALUES ('optimize')" % (FTS_TABLE, FTS_TABLE))
+        elif vendor == 'postgresql':
+            cursor.execute('REINDEX INDEX %s' % PG_INDEX)
+
+
+def _terms(query):
+    return re.findall(r'\w+', query)
+
+
+def _highlight(text):
+    return mark_safe(escape(text).replace(START, '<mark>').replace(STOP, '</mark>'))
+
+
+def _sqlite_matches(terms, limit, offset):
+    #every term must match; the last one also as a prefix while the reader is still typing
+    match = ' '.join('"%s"' % term for term in terms) + '*'
+    sql = (
+        "SELECT blog_post.id, highlight({t}, 0, char(2), char(3)), "
+        "snippet({t}, 1, char(2), char(3), '…', 24) "
+        "FROM {t} JOIN blog_post ON blog_post.id = {t}.rowid "
+        "WHERE {t} MATCH %s AND blog_post.status = %s "
+        "ORDER BY bm25({t}, 10.0, 1.0) LIMIT %s OFFSET %s"
+    ).format(t=FTS_TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, Post.PUBLISHED, limit, offset])
+        return cursor.fetchall()
+
+
+def _postgres_matches(terms, limit, offset):
+    sql = (
+        "SELECT id, ts_headline('{config}', title, q, 'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', HighlightAll=true'), "
+        "ts_headline('{config}', text, q, 'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxWords=35, MinWords=15') "
+        "FROM blog_post, plainto_tsquery('{config}', %s) q "
+        "WHERE ({vector}) @@ q AND status = %s "
+        "ORDER BY ts_rank({vector}, q) DESC, id LIMIT %s OFFSET %s"
+    ).format(config=PG_CONFIG, vector=_pg_vector_sql())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [' '.join(terms), Post.PUBLISHED, limit, offset])
+        return cursor.fetchall()
+
+
+def search(query, page=1, per_page=10):
+    """Ranked, highlighted matches among published posts.
+
+    Returns (posts, has_next). Each post carries ``title_html`` and
+    ``snippet_html`` with matches wrapped in <mark>.
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], False
+    offset = (page - 1) * per_page
+    vendor = _vendor()
+    if vendor == 'sqlite':
+        rows = _sqlite_matches(terms, per_page + 1, offset)
+    elif vendor == 'postgresql':
+        rows = _postgres_matches(terms, per_page + 1, offset)
+    else:
+        posts = Post.objects.published().filter(text__icontains=' '.join(terms)).defer('text')
+        rows = [(post.pk, post.title, post.excerpt) for post in posts.order_by('-published_date')[offset:offset + per_page + 1]]
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    posts = Post.objects.defer('text').in_bulk([row[0] for row in rows])
+    results = []
+    for pk, title, snippet in rows:
+        post = posts.get(pk)
+        if post is None:
+            continue
+        post.title_html = _highlight(title)
+        post.snippet_html = _highlight(snippet)
+        results.append(post)
+    return results, has_next
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.cache import invalidate, invalidate_on_change
+from . import search
+from .models import AUTHOR_FIELDS, Post, author_display_name
+
+
+invalidate_on_change(Post, 'blog')
+
+
+@receiver(pre_save, sender=Post)
+def drop_stale_body(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    old_hash = Post.objects.filter(pk=instance.pk).values_list('text_hash', flat=True).first()
+    if old_hash and old_hash != instance.text_hash:
+        cache.delete(Post.body_cache_key(instance.pk, old_hash))
+
+
+@receiver(post_save, sender=Post)
+def fill_body(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'text' in update_fields:
+        instance.render_body()
+
+
+@receiver(post_delete, sender=Post)
+def drop_body(sender, instance, **kwargs):
+    cache.delete(Post.body_cache_key(instance.pk, instance.text_hash))
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_author_display_name(sender, instance, update_fields=None, **kwargs):
+    #logins save last_login only
+    if update_fields is not None and not set(AUTHOR_FIELDS) & set(update_fields):
+        return
+    name = author_display_name(instance)
+    changed = Post.objects.filter(author=instance).exclude(author_display_name=name)
+    #bumping updated_at changes the ETags of the pages showing the byline
+    if changed.update(author_display_name=name, updated_at=timezone.now()):
+        invalidate('blog')
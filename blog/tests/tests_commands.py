@@ -0,0 +1,51 @@
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+from django.utils.timezone import now, timedelta
+from blog import search
+from blog.models import Post
+from core.models import ChangeMarker
+from .factories import PostFactory
+
+class BackfillExcerptsTest(TestCase):
+    def test_backfill(self):
+        """posts saved without an excerpt get one"""
+        post = PostFactory(text="<b>bold</b>\nbody")
+        Post.objects.filter(pk=post.pk).update(excerpt="", excerpt_html="")
+        call_command("backfill_excerpts", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, "<b>bold</b>\nbody")
+        self.assertEqual(post.excerpt_html, "&lt;b&gt;bold&lt;/b&gt;<br>body")
+
+    def test_backfill_invalidates(self):
+        """changed posts get a new updated_at and the blog's pages and validators move on"""
+        post = PostFactory(text="body")
+        unchanged = PostFactory(text="other")
+        Post.objects.filter(pk=post.pk).update(excerpt="")
+        updated_at = Post.objects.get(pk=unchanged.pk).updated_at
+        version = ChangeMarker.current("blog")[0]
+        out = StringIO()
+        call_command("backfill_excerpts", stdout=out)
+        self.assertIn("Updated 1 posts", out.getvalue())
+        self.assertGreater(Post.objects.get(pk=post.pk).updated_at, post.updated_at)
+        self.assertEqual(Post.objects.get(pk=unchanged.pk).updated_at, updated_at)
+        self.assertGreater(ChangeMarker.current("blog")[0], version)
+
+class RebuildSearchIndexTest(TestCase):
+    def test_rebuild(self):
+        """posts created without signals become searchable after a rebuild"""
+        author = PostFactory().author
+        Post.objects.bulk_create([Post(author=author, title="bulk", text="imported", published_date=now(), status=Post.PUBLISHED)])
+        self.assertEqual(search.search("imported")[0], [])
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual([p.title for p in search.search("imported")[0]], ["bulk"])
+
+
+class PublishScheduledPostsTest(TestCase):
+    def test_publishes_due(self):
+        post = PostFactory(published_date=now() + timedelta(hours=1))
+        Post.objects.filter(pk=post.pk).update(published_date=now() - timedelta(minutes=1))
+        out = StringIO()
+        call_command("publish_scheduled_posts", stdout=out)
+        self.assertIn("Published 1", out.getvalue())
+        self.assertTrue(Post.objects.get(pk=post.pk).is_published)
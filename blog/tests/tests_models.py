@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.timezone import now, timedelta
+from .factories import PostFactory, UserFactory
+from blog.models import Post
+
+class PostBodyCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_filledonsave(self):
+        """saving a post stores its rendered body"""
+        post = PostFactory(text="a\nb")
+        self.assertEqual(cache.get(Post.body_cache_key(post.pk, post.text_hash)), "a<br>b")
+        self.assertEqual(post.body_html, "a<br>b")
+
+    def test_escapes(self):
+        post = PostFactory(text="<script>")
+        self.assertEqual(post.body_html, "&lt;script&gt;")
+
+    def test_invalidatedonedit(self):
+        """editing a post drops the html cached for the old text"""
+        post = PostFactory(text="old")
+        old_key = Post.body_cache_key(post.pk, post.text_hash)
+        post.text = "new"
+        post.save()
+        self.assertIsNone(cache.get(old_key))
+        self.assertEqual(Post.objects.get(pk=post.pk).body_html, "new")
+
+    def test_invalidatedondelete(self):
+        post = PostFactory(text="gone")
+        key = Post.body_cache_key(post.pk, post.text_hash)
+        post.delete()
+        self.assertIsNone(cache.get(key))
+
+class PostStatusTest(TestCase):
+    def test_followspublisheddate(self):
+        """status is derived from published_date when a post is saved"""
+        self.assertEqual(PostFactory(published_date=None).status, Post.DRAFT)
+        self.assertEqual(PostFactory(published_date=now() + timedelta(days=1)).status, Post.SCHEDULED)
+        self.assertEqual(PostFactory(published_date=now() - timedelta(days=1)).status, Post.PUBLISHED)
+
+    def test_publish_due(self):
+        """only scheduled posts whose time has passed are published"""
+        due = PostFactory(published_date=now() + timedelta(hours=1))
+        later = PostFactory(published_date=now() + timedelta(days=1))
+        Post.objects.filter(pk=due.pk).update(published_date=now() - timedelta(minutes=1))
+        self.assertEqual(Post.publish_due(), 1)
+        self.assertEqual(Post.objects.get(pk=due.pk).status, Post.PUBLISHED)
+        self.assertEqual(Post.objects.get(pk=later.pk).status, Post.SCHEDULED)
+        self.assertEqual(Post.publish_due(now() + timedelta(days=2)), 1)
+
+class AuthorDisplayNameTest(TestCase):
+    def test_setonsave(self):
+        """posts copy the author's full name, or the username without one"""
+        self.assertEqual(PostFactory(author=UserFactory(first_name="Ada", last_name="Lovelace")).author_display_name,
+                         "Ada Lovelace")
+        self.assertEqual(PostFactory(author=UserFactory(first_name="", last_name="", username="ada")).author_display_name,
+                         "ada")
+
+    def test_followsrename(self):
+        """renaming the author updates their posts and their updated_at"""
+        post = PostFactory(author=UserFactory(first_name="Ada", last_name="Lovelace"))
+        updated_at = post.updated_at
+        post.author.last_name = "Byron"
+        post.author.save()
+        post.refresh_from_db()
+        self.assertEqual(post.author_display_name, "Ada Byron")
+        self.assertGreater(post.updated_at, updated_at)
+
+    def test_login_skips_sync(self):
+        """saving only last_login does not touch posts"""
+        post = PostFactory()
+        post.author.last_login = now()
+        with self.assertNumQueries(1):
+            post.author.save(update_fields=["last_login"])
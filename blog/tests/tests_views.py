@@ -1,13 +1,18 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.shortcuts import reverse
 from blog.models import Post
+from core.models import ChangeMarker
 from django.contrib.auth import get_user_model
-from django.utils.timezone import timedelta, now
+from django.utils.timezone import timedelta, now, localtime
 from .factories import UserFactory, PostFactory
 
 class PostListTest(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("post_list")
         
     def test_noposts(self):
@@ -27,9 +32,66 @@ class PostListTest(TestCase):
         self.assertIn("something", response.content.decode("utf-8"))
         self.assertNotIn("nothing", response.content.decode("utf-8"))
 
+    @override_settings(BLOG_POSTS_PER_PAGE=2)
+    def test_paginates_with_cursor(self):
+        """posts are split into pages that follow each other by cursor"""
+        yest = now() - timedelta(days=1)
+        posts = [PostFactory(published_date=yest) for i in range(3)]
+        response = self.client.get(self.url)
+        self.assertEqual(list(response.context["posts"]), posts[:2])
+        cursor = response.context["next_cursor"]
+        self.assertIsNotNone(cursor)
+        response = self.client.get(self.url, {"after": cursor})
+        self.assertEqual(list(response.context["posts"]), posts[2:])
+        self.assertIsNone(response.context["next_cursor"])
+
+    @override_settings(BLOG_EXCERPT_LENGTH=20)
+    def test_showsexcerpt(self):
+        """the list shows the stored excerpt instead of the whole body"""
+        PostFactory(published_date=now() - timedelta(days=1), text="first line\nsecond line " + "x" * 100)
+        response = self.client.get(self.url)
+        content = response.content.decode("utf-8")
+        self.assertIn("first line<br>second", content)
+        self.assertNotIn("x" * 100, content)
+        self.assertIn("text", response.context["posts"][0].get_deferred_fields())
+
+    def test_invalidcursor(self):
+        response = self.client.get(self.url, {"after": "notacursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_bylines_constant_queries(self):
+        """bylines cost no queries per post, with two posts or twenty"""
+        yest = now() - timedelta(days=1)
+        for count in (2, 20):
+            cache.clear()
+            for i in range(count - Post.objects.count()):
+                PostFactory(published_date=yest, author=UserFactory(first_name="Ada", last_name="Lovelace%d" % i))
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url)
+            self.assertContains(response, "By Ada Lovelace", count=min(count, 10))
+
+class PostListJsonTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @override_settings(BLOG_POSTS_PER_PAGE=1)
+    def test_json_pages(self):
+        """the json variant returns the same pages with a link to the next one"""
+        yest = now() - timedelta(days=1)
+        first = PostFactory(published_date=yest, title="first")
+        second = PostFactory(published_date=yest, title="second")
+        PostFactory(published_date=now() + timedelta(days=1))
+        data = self.client.get(reverse("post_list_json")).json()
+        self.assertEqual([p["id"] for p in data["posts"]], [first.pk])
+        data = self.client.get(data["next_url"]).json()
+        self.assertEqual([p["id"] for p in data["posts"]], [second.pk])
+        self.assertIsNone(data["next"])
+
 class PostDetailTest(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.author = UserFactory(username="test user", password="testpassword")
         self.tom = now() + timedelta(days=1)
         self.yest = now() - timedelta(days=1)
@@ -45,6 +107,14 @@ class PostDetailTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_no_author_join(self):
+        """the byline is stored on the post, so the page never reads the user table"""
+        post = PostFactory(published_date=self.yest, author=self.author)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("post_detail", kwargs={"pk": post.pk}))
+        self.assertContains(response, "By %s" % post.author_display_name)
+        self.assertFalse([query for query in queries if "auth_user" in query["sql"]])
+
     def test_postexistant_loggedin(self):
         self.assertTrue(self.client.login(username="test user", password="testpassword"))
         postyest = PostFactory(published_date=self.yest, text="something")
@@ -67,9 +137,23 @@ class PostDetailTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
 
+    def test_loggedin_copy_not_revalidated_after_logout(self):
+        """the etag a logged in user got does not match the anonymous page"""
+        post = PostFactory(published_date=self.yest, text="something")
+        url = reverse("post_detail", kwargs= {"pk": post.pk})
+        self.assertTrue(self.client.login(username="test user", password="testpassword"))
+        response = self.client.get(url)
+        self.assertIn("private", response["Cache-Control"])
+        self.client.logout()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"],
+                                   HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Cache-Control", response)
+
 class PostNewTest(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.author = UserFactory(username="test user", password="testpassword")
         self.url = reverse("post_new")
         self.postdata = {
@@ -106,6 +190,7 @@ class PostNewTest(TestCase):
 class PostEditTest(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.author = UserFactory(username="test user", password="testpassword")
         self.postdata = {
             "title": "testpost",
@@ -172,3 +257,149 @@ class PostEditTest(TestCase):
         self.assertTrue(self.client.login(username="test user", password="testpassword"))
         response = self.client.post(self.postdata) 
         self.assertEquals(response.status_code, 404)
+
+class PostSearchTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse("post_search")
+        self.yest = now() - timedelta(days=1)
+
+    def test_ranked_and_highlighted(self):
+        """title matches rank first and matches are wrapped in <mark>"""
+        body = PostFactory(published_date=self.yest, title="other", text="we talked about narratives")
+        title = PostFactory(published_date=self.yest, title="The narrative", text="something")
+        response = self.client.get(self.url, {"q": "narrative"})
+        self.assertEqual(list(response.context["results"]), [title, body])
+        self.assertIn("The <mark>narrative</mark>", response.content.decode("utf-8"))
+
+    def test_escapes(self):
+        PostFactory(published_date=self.yest, text="<script>alert(1)</script> speaker")
+        content = self.client.get(self.url, {"q": "speaker"}).content.decode("utf-8")
+        self.assertNotIn("<script>alert", content)
+        self.assertIn("&lt;script&gt;", content)
+
+    def test_unpublished_hidden(self):
+        PostFactory(published_date=now() + timedelta(days=1), text="secret")
+        response = self.client.get(self.url, {"q": "secret"})
+        self.assertEqual(list(response.context["results"]), [])
+
+    def test_followsedits(self):
+        """the index follows post edits and deletes"""
+        post = PostFactory(published_date=self.yest, text="tickets")
+        post.text = "swag"
+        post.save()
+        self.assertEqual(list(self.client.get(self.url, {"q": "tickets"}).context["results"]), [])
+        self.assertEqual(list(self.client.get(self.url, {"q": "swag"}).context["results"]), [post])
+        post.delete()
+        self.assertEqual(list(self.client.get(self.url, {"q": "swag"}).context["results"]), [])
+
+    @override_settings(BLOG_POSTS_PER_PAGE=1)
+    def test_paginates(self):
+        posts = [PostFactory(published_date=self.yest, text="event") for i in range(2)]
+        first = self.client.get(self.url, {"q": "event"})
+        self.assertTrue(first.context["has_next"])
+        second = self.client.get(self.url, {"q": "event", "page": 2})
+        self.assertFalse(second.context["has_next"])
+        self.assertEqual(set(first.context["results"]) | set(second.context["results"]), set(posts))
+
+    def test_syntax_is_not_interpreted(self):
+        """search operators typed by readers are treated as plain words"""
+        response = self.client.get(self.url, {"q": 'NEAR( "unbalanced OR'})
+        self.assertEqual(response.status_code, 200)
+
+class PostFeedTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.yest = now() - timedelta(days=1)
+
+    @override_settings(BLOG_FEED_SIZE=2)
+    def test_atom(self):
+        """the atom feed lists the latest published posts, newest first"""
+        PostFactory(published_date=self.yest - timedelta(hours=2), title="oldest")
+        PostFactory(published_date=self.yest - timedelta(hours=1), title="middle")
+        PostFactory(published_date=self.yest, title="newest")
+        PostFactory(published_date=now() + timedelta(days=1), title="scheduled")
+        response = self.client.get(reverse("post_feed_atom"))
+        self.assertEqual(response["Content-Type"], "application/atom+xml; charset=utf-8")
+        content = response.content.decode("utf-8")
+        self.assertLess(content.index("newest"), content.index("middle"))
+        self.assertNotIn("oldest", content)
+        self.assertNotIn("scheduled", content)
+
+    def test_json(self):
+        post = PostFactory(published_date=self.yest, text="line\nbreak")
+        data = self.client.get(reverse("post_feed_json")).json()
+        self.assertEqual(data["items"][0]["content_html"], "line<br>break")
+        self.assertTrue(data["items"][0]["url"].endswith(reverse("post_detail", kwargs={"pk": post.pk})))
+
+    def test_polling(self):
+        """an unchanged feed is answered with 304 without querying the database"""
+        PostFactory(published_date=self.yest)
+        url = reverse("post_feed_atom")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_regenerated_on_edit(self):
+        post = PostFactory(published_date=self.yest, title="before")
+        url = reverse("post_feed_json")
+        etag = self.client.get(url)["ETag"]
+        post.title = "after"
+        post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0]["title"], "after")
+
+    def test_delete_moves_last_modified(self):
+        """removing the newest entry is a change to feed readers that only send If-Modified-Since"""
+        PostFactory(published_date=self.yest - timedelta(hours=1))
+        newest = PostFactory(published_date=self.yest)
+        ChangeMarker.objects.update(changed_at=self.yest)
+        url = reverse("post_feed_atom")
+        last_modified = self.client.get(url)["Last-Modified"]
+        newest.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+class PostSchedulingTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.author = UserFactory(username="test user", password="testpassword")
+        self.assertTrue(self.client.login(username="test user", password="testpassword"))
+
+    def test_schedule(self):
+        """a future publish date schedules the post instead of publishing it"""
+        when = (now() + timedelta(days=2)).strftime("%Y-%m-%dT%H:%M")
+        self.client.post(reverse("post_new"), {"title": "later", "text": "soon", "published_date": when})
+        post = Post.objects.get(title="later")
+        self.assertEqual(post.status, Post.SCHEDULED)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("post_detail", kwargs={"pk": post.pk})).status_code, 404)
+
+    def test_draft(self):
+        self.client.post(reverse("post_new"), {"title": "wip", "text": "draft", "draft": "1"})
+        post = Post.objects.get(title="wip")
+        self.assertEqual((post.status, post.published_date), (Post.DRAFT, None))
+
+    def test_edit_keeps_publish_date(self):
+        """editing a published post no longer moves its publish date"""
+        post = PostFactory(published_date=now() - timedelta(days=3))
+        published = post.published_date.strftime("%Y-%m-%dT%H:%M")
+        self.client.post(reverse("post_edit", kwargs={"pk": post.pk}), {"title": "t", "text": "edited", "published_date": published})
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertLess(post.published_date, now() - timedelta(days=2))
+
+    def test_edit_keeps_publish_seconds(self):
+        """the minute-level widget does not truncate the stored publish date"""
+        post = PostFactory(published_date=(now() - timedelta(days=3)).replace(second=42, microsecond=7))
+        published = localtime(post.published_date).strftime("%Y-%m-%dT%H:%M")
+        self.client.post(reverse("post_edit", kwargs={"pk": post.pk}), {"title": "t", "text": "edited", "published_date": published})
+        before = post.published_date
+        post.refresh_from_db()
+        self.assertEqual(post.published_date, before)
@@ -1,8 +1,12 @@
 from django.urls import path
-from . import views
+from . import feeds, views
 
 urlpatterns = [
     path('', views.post_list, name='post_list'),
+    path('posts.json', views.post_list_json, name='post_list_json'),
+    path('search/', views.post_search, name='post_search'),
+    path('feed/atom/', feeds.post_feed_atom, name='post_feed_atom'),
+    path('feed.json', feeds.post_feed_json, name='post_feed_json'),
     path('post/<int:pk>/', views.post_detail, name='post_detail'),
     path('post/new/', views.post_new, name='post_new'),
     path('post/<int:pk>/edit/', views.post_edit, name='post_edit'),
@@ -3,22 +3,97 @@ from django.utils import timezone
 from .models import Post
 from .forms import PostForm
 from django.shortcuts import redirect
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.conf import settings
+from django.urls import reverse
+from core.cache import cache_public_page
+from core.conditional import conditional_page, latest, make_etag, namespace_validators
+from core.pagination import keyset_page, InvalidCursor
+from core.views import public_page
+from . import search
 
+POST_LIST_ORDERING = ('published_date', 'pk')
+
+#publishing is a save, scheduled ones by publish_scheduled_posts, so
+#signal invalidation covers posts going live
+blog_page_cache = cache_public_page('blog')
+
+#the list changes only through saves and deletes, which invalidate 'blog'
+_post_list_validators = namespace_validators('blog')
+
+def _post_detail_validators(request, pk):
+    post = Post.objects.filter(pk=pk).values('updated_at', 'published_date', 'status').first()
+    if post is None:
+        return None
+    if not request.user.is_authenticated and post['status'] != Post.PUBLISHED:
+        return None
+    #logged in users see drafts, so their copy must never revalidate an anonymous one
+    etag = make_etag(pk, post['updated_at'], post['published_date'], request.user.is_authenticated)
+    return etag, latest(post['updated_at'], post['published_date'])
+
+def _published_page(request):
+    posts = Post.objects.published().defer('text')
+    try:
+        return keyset_page(posts, request.GET.get('after'), settings.BLOG_POSTS_PER_PAGE, POST_LIST_ORDERING)
+    except InvalidCursor:
+        raise Http404()
+
+@conditional_page(_post_list_validators)
+@blog_page_cache
+@public_page('blog/post_list.html')
 def post_list(request):
-    posts = Post.objects.filter(published_date__lte=timezone.now()).order_by('published_date')
-    return render(request, 'blog/post_list.html', {'posts': posts})
+    posts, next_cursor = _published_page(request)
+    return {'posts': posts, 'next_cursor': next_cursor}
+
+@conditional_page(_post_list_validators)
+@blog_page_cache
+def post_list_json(request):
+    posts, next_cursor = _published_page(request)
+    data = {
+        'posts': [{
+            'id': post.pk,
+            'title': post.title,
+            'excerpt': post.excerpt,
+            'excerpt_html': post.excerpt_html,
+            'published_date': post.published_date.isoformat(),
+            'url': reverse('post_detail', kwargs={'pk': post.pk}),
+        } for post in posts],
+        'next': next_cursor,
+        'next_url': '%s?after=%s' % (reverse('post_list_json'), next_cursor) if next_cursor else None,
+    }
+    return JsonResponse(data)
 
+@blog_page_cache
+def post_search(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        raise Http404()
+    results, has_next = search.search(query, page, settings.BLOG_POSTS_PER_PAGE)
+    return render(request, 'blog/post_search.html', {
+        'query': query,
+        'results': results,
+        'page': page,
+        'has_next': has_next,
+    })
+
+@conditional_page(_post_detail_validators)
+@blog_page_cache
+@public_page('blog/post_detail.html')
 def post_detail(request, pk):
     post = get_object_or_404(Post, pk=pk)
     #only logged in users should see unpublished posts
-    if not request.user.is_authenticated:
-        if post.published_date>timezone.now():
-            raise Http404()
-        else:
-            return render(request, 'blog/post_detail.html', {'post': post})
-    else:
-        return render(request, 'blog/post_detail.html', {'post': post})
+    if not request.user.is_authenticated and not post.is_published:
+        raise Http404()
+    return {'post': post}
+
+def _schedule(request, post):
+    #an empty date publishes now, a future one schedules, "Save draft" unpublishes
+    if 'draft' in request.POST:
+        post.published_date = None
+    elif post.published_date is None:
+        post.published_date = timezone.now()
 
 def post_new(request): 
     #if user is not logged in, return a 404 response
@@ -29,7 +104,7 @@ def post_new(request):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.published_date = timezone.now()
+            _schedule(request, post)
             post.save()
             return redirect('post_detail', pk=post.pk)
     else:
@@ -45,7 +120,7 @@ def post_edit(request, pk):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.published_date = timezone.now()
+            _schedule(request, post)
             post.save()
             return redirect('post_detail', pk=post.pk)
     else:
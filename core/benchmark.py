@@ -0,0 +1,101 @@
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from blog.models import Post
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+from .performance import percentile
+from .seeding import Seeder
+
+#most queries a page may run, whatever the number of rows behind it
+QUERY_CEILINGS = {
+    'homepage': 0,
+    'post_list': 2,
+    'post_list_json': 2,
+    'post_search': 2,
+    'post_detail': 2,
+    'pictures_page': 2,
+    'sponsors_page': 2,
+}
+
+
+def seed(posts=0, pictures=0, sponsors=0, batch_size=500):
+    """Add synthetic rows, as seed_data does, without queueing derivatives."""
+    seeder = Seeder(batch_size=batch_size, derivatives=False)
+    if posts:
+        seeder.posts(posts, seeder.users(1))
+    seeder.images(Picture, pictures)
+    seeder.images(Sponsors, sponsors)
+
+
+def pages():
+    """``(name, url)`` for every public page, using rows that exist."""
+    urls = [
+        ('homepage', reverse('homepage')),
+        ('post_list', reverse('post_list')),
+        ('post_list_json', reverse('post_list_json')),
+        ('pictures_page', reverse('pictures_page')),
+        ('sponsors_page', reverse('sponsors_page')),
+    ]
+    post = Post.objects.published().only('pk', 'title').first()
+    if post is not None:
+        urls.append(('post_detail', reverse('post_detail', kwargs={'pk': post.pk})))
+        urls.append(('post_search', '%s?q=%s' % (reverse('post_search'), post.title.split()[0])))
+    return urls
+
+
+def without_page_cache():
+    """Point the page cache at a dummy backend so each request does the work."""
+    caches = dict(settings.CACHES, benchmark_pages={'BACKEND': 'django.core.cache.backends.dummy.DummyCache'})
+    return override_settings(CACHES=caches, PAGE_CACHE_ALIAS='benchmark_pages')
+
+
+def measure(url, requests, host='testserver'):
+    """Query count, latency percentiles and peak traced memory for ``url``."""
+    client = Client(HTTP_HOST=host)
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError('%s returned %d' % (url, response.status_code))
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        client.get(url)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'url': url,
+        'queries': len(queries),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'bytes': len(response.content),
+    }
+
+
+def run(requests=50, host='testserver'):
+    """Measure every page with the page cache bypassed."""
+    with without_page_cache():
+        report = {name: measure(url, requests, host) for name, url in pages()}
+    for name, result in report.items():
+        result['query_ceiling'] = QUERY_CEILINGS[name]
+    return report
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import uuid
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from .models import ChangeMarker
+
+
+def _cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return 'pagecache:version:%s' % namespace
+
+
+def namespace_version(namespace):
+    cache = _cache()
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), uuid.uuid4().hex, None)
+        #a DummyCache never stores it; any value then misses, as it should
+        version = cache.get(_version_key(namespace)) or uuid.uuid4().hex
+    return version
+
+
+def invalidate(namespace):
+    """Orphan every page cached under ``namespace`` and move its validators on."""
+    _cache().set(_version_key(namespace), uuid.uuid4().hex, None)
+    ChangeMarker.bump(namespace)
+
+
+def invalidate_on_change(model, namespace):
+    """Invalidate ``namespace`` whenever a ``model`` row is saved or deleted."""
+    def handler(sender, **kwargs):
+        invalidate(namespace)
+    uid = 'invalidate:%s:%s' % (model._meta.label, namespace)
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _is_anonymous_get(request):
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def _page_key(view, request, namespaces):
+    versions = ':'.join(namespace_version(namespace) for namespace in namespaces)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return 'pagecache:page:%s:%s:%s' % (view.__module__, url, versions)
+
+
+def _lookup(view, request, namespaces):
+    """Return (key, cached response) for an anonymous GET, else (None, None)."""
+    if not _is_anonymous_get(request):
+        return None, None
+    key = _page_key(view, request, namespaces)
+    return key, _cache().get(key)
+
+
+def _store(key, response, timeout):
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        _cache().set(key, response, settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout)
+
+
+def cache_public_page(*namespaces, timeout=None):
+    """Cache a view's successful GET responses for anonymous users.
+
+    Entries are keyed by the absolute URL and the current version of each
+    namespace, so ``invalidate(namespace)`` drops them all at once. Async
+    views get an async wrapper that does the session and cache work in a
+    thread.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapped(request, *args, **kwargs):
+                key, response = await sync_to_async(_lookup)(view, request, namespaces)
+                if response is not None:
+                    return response
+                response = await view(request, *args, **kwargs)
+                if key is not None:
+                    await sync_to_async(_store)(key, response, timeout)
+                return response
+            return async_wrapped
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            key, response = _lookup(view, request, namespaces)
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if key is not None:
+                _store(key, response, timeout)
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,35 @@
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.checks import Warning, register
+
+from .staticfiles import BundledManifestStorage, brotli
+
+
+#not tagged staticfiles: collectstatic runs those checks and must not fail on this one
+@register()
+def check_static_manifest(app_configs, **kwargs):
+    """Fingerprinted static URLs need the manifest written by collectstatic.
+
+    Without it pages link the plain, uncompressed files, which the front
+    server cannot cache for long.
+    """
+    if not isinstance(staticfiles_storage, ManifestFilesMixin):
+        return []
+    if staticfiles_storage.exists(staticfiles_storage.manifest_name):
+        return []
+    return [Warning(
+        'The static files manifest %s is missing.' % staticfiles_storage.path(staticfiles_storage.manifest_name),
+        hint='Run "manage.py collectstatic" on every deploy while DEBUG is off.',
+        id='core.W001',
+    )]
+
+
+@register()
+def check_brotli(app_configs, **kwargs):
+    """collectstatic only writes .br siblings when brotli is installed."""
+    if brotli is not None or not isinstance(staticfiles_storage, BundledManifestStorage):
+        return []
+    return [Warning(
+        'brotli is not installed, so collectstatic writes no .br static files.',
+        hint='Install the packages in requirements.txt.',
+        id='core.W002',
+    )]
@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import ChangeMarker
+
+
+def make_etag(*parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _validate(request, result):
+    """Return (etag, timestamp, not-modified response or None)."""
+    etag, last_modified = result
+    etag = quote_etag(etag) if etag else None
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp, get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def _annotate(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        if etag and not response.has_header('ETag'):
+            response['ETag'] = etag
+        if timestamp and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def conditional_page(validators):
+    """Answer conditional GETs before the view runs.
+
+    ``validators(request, *args, **kwargs)`` returns ``(etag, last_modified)``
+    from a cheap query, or None when the view should decide on its own
+    (e.g. to raise a 404). Unlike django's ``condition`` decorator both
+    validators come from a single call. For async views the validators run
+    in a thread.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapped(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                result = await sync_to_async(validators)(request, *args, **kwargs)
+                if result is None:
+                    return await view(request, *args, **kwargs)
+                etag, timestamp, response = _validate(request, result)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _annotate(response, etag, timestamp)
+            return async_wrapped
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            result = validators(request, *args, **kwargs)
+            if result is None:
+                return view(request, *args, **kwargs)
+            etag, timestamp, response = _validate(request, result)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _annotate(response, etag, timestamp)
+        return wrapped
+    return decorator
+
+
+def namespace_validators(*namespaces):
+    """Validators for a page that changes only through ``invalidate(namespace)``.
+
+    One primary key lookup per namespace, however many rows the page shows.
+    """
+    def validators(request, *args, **kwargs):
+        markers = [ChangeMarker.current(namespace) for namespace in namespaces]
+        etag = make_etag(*namespaces, *[version for version, _ in markers])
+        return etag, latest(*[changed_at for _, changed_at in markers])
+    return validators
+
+
+def latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
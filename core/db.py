@@ -0,0 +1,50 @@
+import os
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def database_from_env(base_dir, environ=os.environ):
+    """Build DATABASES['default'] from the environment.
+
+    DB_PROFILE=sqlite (default) uses SQLITE_PATH or db.sqlite3;
+    DB_PROFILE=postgres reads DATABASE_URL. DB_CONN_MAX_AGE keeps
+    connections open between requests.
+    """
+    profile = environ.get('DB_PROFILE', 'sqlite')
+    conn_max_age = int(environ.get('DB_CONN_MAX_AGE', 60))
+    if profile == 'sqlite':
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('SQLITE_PATH', os.path.join(base_dir, 'db.sqlite3')),
+            'CONN_MAX_AGE': conn_max_age,
+            #seconds a writer waits on a locked database before "database is locked"
+            'OPTIONS': {'timeout': float(environ.get('SQLITE_BUSY_TIMEOUT', 20))},
+        }
+    if profile == 'postgres':
+        if 'DATABASE_URL' not in environ:
+            raise ImproperlyConfigured('DB_PROFILE=postgres needs DATABASE_URL')
+        url = urlparse(environ['DATABASE_URL'])
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': unquote(url.path.lstrip('/')),
+            'USER': unquote(url.username or ''),
+            'PASSWORD': unquote(url.password or ''),
+            'HOST': url.hostname or '',
+            'PORT': str(url.port or ''),
+            'CONN_MAX_AGE': conn_max_age,
+            #transaction pooling in pgbouncer cannot keep server-side cursors open
+            'DISABLE_SERVER_SIDE_CURSORS': environ.get('DB_PGBOUNCER') == 'True',
+            'OPTIONS': {'connect_timeout': int(environ.get('DB_CONNECT_TIMEOUT', 5))},
+        }
+    raise ImproperlyConfigured('Unknown DB_PROFILE %r' % profile)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply settings.SQLITE_PRAGMAS to every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute('PRAGMA %s = %s' % (pragma, value))
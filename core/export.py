@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.db.models import Count, Max
+from django.test import Client
+from django.urls import resolve, reverse
+
+from blog.models import Post
+from core.conditional import make_etag
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+MANIFEST = '.export-manifest.json'
+ASSET_RE = re.compile(r'''(?P<attr>(?:href|src)=["'])%s(?P<path>[^"'?#]+)''' % re.escape(settings.STATIC_URL))
+PAGE_LINK_RE = re.compile(r'''href="\?after=(?P<cursor>[\w-]+)"''')
+
+
+def _aggregate_signature(queryset, *fields):
+    stats = queryset.aggregate(count=Count('pk'), **{field: Max(field) for field in fields})
+    return make_etag(*[stats[key] for key in sorted(stats)])
+
+
+class SiteExporter:
+    """Render every public page to ``<output>/<path>/index.html``.
+
+    Each page is rendered only when the rows it shows changed since the
+    last export, tracked in a manifest next to the files.
+    """
+
+    def __init__(self, output, host, full=False):
+        self.output = output
+        self.client = Client(HTTP_HOST=host)
+        manifest_path = os.path.join(output, MANIFEST)
+        self.previous = {}
+        if not full and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.previous = json.load(f)
+        self.manifest = {}
+        self.rendered = []
+        self.skipped = []
+        self.removed = []
+        self.assets = {}
+
+    def signatures(self):
+        return {
+            'homepage': 'static',
+            'post_list': _aggregate_signature(Post.objects.published(), 'updated_at', 'published_date'),
+            'pictures_page': _aggregate_signature(Picture.objects.all(), 'updated_at'),
+            'sponsors_page': _aggregate_signature(Sponsors.objects.all(), 'updated_at'),
+        }
+
+    def seeds(self):
+        posts = Post.objects.published().values_list('pk', 'updated_at', 'published_date')
+        yield reverse('homepage'), None
+        yield reverse('post_list'), None
+        yield reverse('pictures_page'), None
+        yield reverse('sponsors_page'), None
+        for pk, updated_at, published_date in posts.iterator():
+            yield reverse('post_detail', kwargs={'pk': pk}), make_etag(pk, updated_at, published_date)
+
+    def run(self):
+        os.makedirs(self.output, exist_ok=True)
+        signatures = self.signatures()
+        queue = list(self.seeds())
+        while queue:
+            url, signature = queue.pop(0)
+            if url in self.manifest:
+                continue
+            if signature is None:
+                signature = signatures[resolve(url.split('?')[0]).url_name]
+            previous = self.previous.get(url)
+            if previous and previous['signature'] == signature and os.path.exists(self.path_for(url)):
+                self.manifest[url] = previous
+                self.skipped.append(url)
+            else:
+                self.manifest[url] = {'signature': signature, 'links': self.export(url)}
+                self.rendered.append(url)
+            queue.extend((link, signature) for link in self.manifest[url]['links'])
+        for url in set(self.previous) - set(self.manifest):
+            self.remove(url)
+        with open(os.path.join(self.output, MANIFEST), 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+
+    def path_for(self, url):
+        path, _, query = url.partition('?')
+        parts = [part for part in path.split('/') if part]
+        cursor = parse_qs(query).get('after')
+        if cursor:
+            parts += ['after', cursor[0]]
+        return os.path.join(self.output, *parts, 'index.html')
+
+    def static_url_for(self, url):
+        return '/' + os.path.relpath(os.path.dirname(self.path_for(url)), self.output).replace(os.sep, '/') + '/'
+
+    def export(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError('%s returned %d' % (url, response.status_code))
+        html = response.content.decode(response.charset)
+        path = url.split('?')[0]
+        links = ['%s?after=%s' % (path, match.group('cursor')) for match in PAGE_LINK_RE.finditer(html)]
+        #query strings cannot be served from files, so cursor pages become paths
+        html = PAGE_LINK_RE.sub(lambda m: 'href="%s"' % self.static_url_for('%s?after=%s' % (path, m.group('cursor'))), html)
+        html = ASSET_RE.sub(lambda m: m.group('attr') + self.asset(m.group('path')), html)
+        target = self.path_for(url)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(html)
+        return links
+
+    def asset(self, name):
+        """Copy a static file under a content-hashed name and return its URL."""
+        if name not in self.assets:
+            source = finders.find(name)
+            if source is None:
+                self.assets[name] = settings.STATIC_URL + name
+                return self.assets[name]
+            with open(source, 'rb') as f:
+                digest = hashlib.md5(f.read()).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            hashed = '%s.%s%s' % (stem, digest, ext)
+            target = os.path.join(self.output, 'static', *hashed.split('/'))
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, target)
+            self.assets[name] = settings.STATIC_URL + hashed
+        return self.assets[name]
+
+    def remove(self, url):
+        path = self.path_for(url)
+        if os.path.exists(path):
+            os.remove(path)
+        directory = os.path.dirname(path)
+        while directory != self.output and os.path.isdir(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+        self.removed.append(url)
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def default_host():
+    """The first usable ``ALLOWED_HOSTS`` entry, for commands that request pages in-process.
+
+    Read when a command runs rather than when its parser is built, so an
+    empty or wildcard ``ALLOWED_HOSTS`` does not break ``manage.py help``.
+    """
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+    return hosts[0] if hosts else 'localhost'
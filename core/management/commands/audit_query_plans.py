@@ -0,0 +1,113 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from blog.models import Post
+from core.benchmark import pages, without_page_cache
+from core.management import default_host
+from imaging.models import ImageJob
+
+#tables a hot query may read whole, with the reason
+ALLOWED_SCANS = {
+    'sponsors_sponsors': 'the sponsors page lists every sponsor, a few dozen rows',
+}
+#a SCAN reads the whole table, or the whole index it names
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$')
+#an index walked in order under a LIMIT stops after a page
+LIMIT_RE = re.compile(r'\bLIMIT\b')
+POSTGRES_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+
+def _background_queries():
+    """Hot queries run by the workers rather than by views."""
+    return [
+        ('publish_scheduled_posts', Post.objects.due().query.sql_with_params()),
+        ('process_image_jobs', ImageJob.objects.filter(status=ImageJob.PENDING).order_by('created_at')
+         .values_list('pk', flat=True)[:settings.IMAGE_JOB_BATCH_SIZE].query.sql_with_params()),
+    ]
+
+
+class Command(BaseCommand):
+    help = ('Explain every query the public pages, API and workers run and fail on full table scans. '
+            'Run it against a database seeded with seed_data, as planners scan tiny tables anyway.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--allow-scan', action='append', default=[], metavar='TABLE',
+                            help='Also accept full scans of this table')
+        parser.add_argument('--host', help='Host header to send; defaults to the first ALLOWED_HOSTS entry')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError('Query plans can only be audited on SQLite and PostgreSQL')
+        allowed = set(ALLOWED_SCANS) | set(options['allow_scan'])
+        failures = []
+        captured = self.captured(options['host'] or default_host())
+        for name, queries in captured + [(n, [q]) for n, q in _background_queries()]:
+            for sql, params in queries:
+                plan = self.explain(sql, params)
+                scans = [table for table in self.scans(sql, plan) if table not in allowed]
+                if scans:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR('%s scans %s:' % (name, ', '.join(scans))))
+                    self.stdout.write('  %s' % sql)
+                    for line in plan:
+                        self.stdout.write('    %s' % line)
+            if name not in failures:
+                self.stdout.write('%s: %d queries use indexes' % (name, len(queries)))
+        if failures:
+            raise CommandError('Full table scans in %s' % ', '.join(sorted(set(failures))))
+
+    def urls(self):
+        return pages() + [
+            ('post_feed_atom', reverse('post_feed_atom')),
+            ('post_feed_json', reverse('post_feed_json')),
+            ('api_post_list', reverse('api_post_list')),
+            ('api_post_ids', '%s?ids=1,2,3' % reverse('api_post_list')),
+            ('api_picture_list', reverse('api_picture_list')),
+            ('api_sponsor_list', reverse('api_sponsor_list')),
+        ]
+
+    def captured(self, host):
+        client = Client(HTTP_HOST=host)
+        results = []
+        with without_page_cache():
+            for name, url in self.urls():
+                queries = []
+
+                def capture(execute, sql, params, many, context):
+                    queries.append((sql, params))
+                    return execute(sql, params, many, context)
+
+                with connection.execute_wrapper(capture):
+                    response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError('%s returned %d' % (url, response.status_code))
+                results.append((name, queries))
+        return results
+
+    def explain(self, sql, params):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                return [row[-1] for row in cursor.fetchall()]
+            #with sequential scans priced out, any left are ones no index can replace
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def scans(self, sql, plan):
+        if connection.vendor != 'sqlite':
+            for line in plan:
+                match = POSTGRES_SCAN_RE.search(line)
+                if match:
+                    yield match.group(1)
+            return
+        bounded = LIMIT_RE.search(sql) and not any('TEMP B-TREE' in line for line in plan)
+        for line in plan:
+            match = SQLITE_SCAN_RE.search(line.strip())
+            if match and not (match.group(2) and bounded):
+                yield match.group(1)
@@ -0,0 +1,75 @@
+import copy
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from blog.models import Post
+from core.management import default_host
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+DUMMY_CACHE = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+FRAGMENT_CACHE = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                  'LOCATION': 'benchmark_template_fragments', 'TIMEOUT': None}
+
+
+def _base_loaders():
+    loaders = settings.TEMPLATES[0]['OPTIONS']['loaders']
+    #outside DEBUG the configured loaders sit inside the cached loader
+    if len(loaders) == 1 and isinstance(loaders[0], tuple) and loaders[0][0] == CACHED_LOADER:
+        return list(loaders[0][1])
+    return list(loaders)
+
+
+def _settings(cached):
+    """Template and cache settings for one side of the comparison.
+
+    The page cache points at a dummy backend in both, so every request
+    renders its template.
+    """
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = _base_loaders()
+    templates[0]['OPTIONS']['loaders'] = [(CACHED_LOADER, loaders)] if cached else loaders
+    caches = dict(settings.CACHES, benchmark_pages=DUMMY_CACHE,
+                  template_fragments=FRAGMENT_CACHE if cached else DUMMY_CACHE)
+    return override_settings(TEMPLATES=templates, CACHES=caches, PAGE_CACHE_ALIAS='benchmark_pages')
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request render time with and without template loader and fragment caching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per page and configuration')
+        parser.add_argument('--host', help='Host header to send; defaults to the first ALLOWED_HOSTS entry')
+
+    def pages(self):
+        pages = [reverse('homepage'), reverse('post_list'), reverse('pictures_page'), reverse('sponsors_page')]
+        post = Post.objects.published().only('pk').first()
+        if post is not None:
+            pages.append(reverse('post_detail', kwargs={'pk': post.pk}))
+        return pages
+
+    def measure(self, client, url, requests):
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError('%s returned %d' % (url, response.status_code))
+        return (time.perf_counter() - start) * 1000 / requests
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=options['host'] or default_host())
+        pages = self.pages()
+        timings = {}
+        for cached in (False, True):
+            with _settings(cached):
+                for url in pages:
+                    timings[url, cached] = self.measure(client, url, options['requests'])
+        self.stdout.write('%-30s %10s %10s %8s' % ('page', 'before ms', 'after ms', 'speedup'))
+        for url in pages:
+            before, after = timings[url, False], timings[url, True]
+            self.stdout.write('%-30s %10.2f %10.2f %7.2fx' % (url, before, after, before / after))
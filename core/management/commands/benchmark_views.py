@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmark
+from core.management import default_host
+
+
+class Command(BaseCommand):
+    help = ('Report query counts, latency percentiles and peak memory for every public page as JSON. '
+            'Use --seed against a scratch database (SQLITE_PATH) only.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Add synthetic rows before measuring')
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--pictures', type=int, default=2000)
+        parser.add_argument('--sponsors', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per page')
+        parser.add_argument('--host', help='Host header to send; defaults to the first ALLOWED_HOSTS entry')
+        parser.add_argument('--output', help='Write the report here instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            benchmark.seed(options['posts'], options['pictures'], options['sponsors'])
+        try:
+            report = benchmark.run(options['requests'], options['host'] or default_host())
+        except RuntimeError as exc:
+            raise CommandError(exc)
+        data = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(data + '\n')
+        else:
+            self.stdout.write(data)
+        over = [name for name, result in report.items() if result['queries'] > result['query_ceiling']]
+        if over:
+            raise CommandError('Query ceiling exceeded by %s' % ', '.join(over))
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.export import SiteExporter
+from core.management import default_host
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the public pages to static HTML for the front web server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.STATIC_EXPORT_ROOT)
+        parser.add_argument('--host', help='Host header to send; defaults to the first ALLOWED_HOSTS entry')
+        parser.add_argument('--full', action='store_true',
+                            help='Re-render every page, e.g. after a template change')
+
+    def handle(self, *args, **options):
+        exporter = SiteExporter(options['output'], options['host'] or default_host(), full=options['full'])
+        exporter.run()
+        self.stdout.write(self.style.SUCCESS('Rendered %d pages, %d unchanged, %d removed' % (
+            len(exporter.rendered), len(exporter.skipped), len(exporter.removed))))
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.performance import percentile
+
+
+class Command(BaseCommand):
+    help = ('Send concurrent slow clients to a running server and report throughput and latency. '
+            'Run it once against the WSGI server (gunicorn) and once against the ASGI one (uvicorn) '
+            'serving the same database to compare them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Base URL of the server, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Page to request, may be repeated; defaults to the public pages')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=200, help='Clients connected at once')
+        parser.add_argument('--client-delay', type=float, default=0.5,
+                            help='Seconds each client pauses while sending its request and between reads')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('url must be a plain http:// URL')
+        self.options = options
+        self.address = (url.hostname, url.port or 80)
+        self.host = url.netloc
+        paths = options['paths'] or ['/', '/blog/', '/pictures/', '/sponsors/']
+        paths = [paths[i % len(paths)] for i in range(options['requests'])]
+        elapsed, outcomes = asyncio.run(self.run(paths))
+        latencies = [latency for latency, error in outcomes if not error]
+        errors = sum(error for _, error in outcomes)
+        self.stdout.write('%8s %7s %9s %9s %9s %9s' % ('requests', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+        if not latencies:
+            raise CommandError('Every request failed')
+        self.stdout.write('%8d %7d %9.1f %9.1f %9.1f %9.1f' % (
+            len(outcomes), errors, len(latencies) / elapsed,
+            percentile(latencies, 50), percentile(latencies, 95), percentile(latencies, 99)))
+
+    async def run(self, paths):
+        slots = asyncio.Semaphore(self.options['concurrency'])
+
+        async def limited(path):
+            async with slots:
+                return await self.request(path)
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(limited(path) for path in paths))
+        return time.perf_counter() - start, outcomes
+
+    async def request(self, path):
+        """One GET by a client on a slow link: ``(latency ms, failed)``."""
+        delay = self.options['client_delay']
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(*self.address), self.options['timeout'])
+            try:
+                writer.write(('GET %s HTTP/1.1\r\n' % path).encode())
+                await writer.drain()
+                #a sync worker is held while the rest of the request trickles in
+                await asyncio.sleep(delay)
+                writer.write(('Host: %s\r\nConnection: close\r\n\r\n' % self.host).encode())
+                await writer.drain()
+                status = await asyncio.wait_for(reader.readline(), self.options['timeout'])
+                while await asyncio.wait_for(reader.read(65536), self.options['timeout']):
+                    await asyncio.sleep(delay)
+            finally:
+                writer.close()
+        except (OSError, asyncio.TimeoutError):
+            return (time.perf_counter() - start) * 1000, True
+        return (time.perf_counter() - start) * 1000, status.split()[1:2] != [b'200']
@@ -0,0 +1,44 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.seeding import Seeder
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with synthetic users, posts, pictures and sponsors for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--pictures', type=int, default=2000)
+        parser.add_argument('--sponsors', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Image drawing processes; 0 draws in this process')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for repeatable datasets')
+        parser.add_argument('--no-derivatives', action='store_true',
+                            help='Do not queue derivative jobs for the new images')
+
+    def handle(self, *args, **options):
+        self.started = time.monotonic()
+        seeder = Seeder(options['seed'], options['batch_size'], derivatives=not options['no_derivatives'],
+                        progress=self.progress)
+        authors = seeder.users(options['users'])
+        if authors:
+            seeder.posts(options['posts'], authors)
+        for model, count in ((Picture, options['pictures']), (Sponsors, options['sponsors'])):
+            if count and options['workers']:
+                with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                    seeder.images(model, count, lambda fn, seeds: executor.map(fn, seeds, chunksize=8))
+            else:
+                seeder.images(model, count)
+        self.stdout.write(self.style.SUCCESS('Seeded in %.1fs' % (time.monotonic() - self.started)))
+
+    def progress(self, message, count):
+        elapsed = time.monotonic() - self.started
+        self.stdout.write('%s %d (%.1fs)' % (message, count, elapsed))
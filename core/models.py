@@ -0,0 +1,34 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class ChangeMarker(models.Model):
+    """When the content behind a page cache namespace last changed.
+
+    ``core.cache.invalidate`` bumps the row, so pages can take their ETag
+    and Last-Modified from one primary key lookup instead of aggregating
+    the rows they show. Deletes and unpublishing move it forward too.
+    """
+    namespace = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return '%s %d' % (self.namespace, self.version)
+
+    @classmethod
+    def bump(cls, namespace):
+        now = timezone.now()
+        if not cls.objects.filter(pk=namespace).update(version=F('version') + 1, changed_at=now):
+            cls.objects.get_or_create(pk=namespace, defaults={'version': 1, 'changed_at': now})
+
+    @classmethod
+    def current(cls, namespace):
+        """``(version, changed_at)`` of ``namespace``."""
+        marker = cls.objects.filter(pk=namespace).values_list('version', 'changed_at').first()
+        if marker is None:
+            #nothing has changed since the table was created; start the clock now
+            created, _ = cls.objects.get_or_create(pk=namespace)
+            marker = created.version, created.changed_at
+        return marker
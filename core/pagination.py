@@ -0,0 +1,72 @@
+import base64
+import json
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def encode_cursor(obj, fields):
+    values = []
+    for name in fields:
+        value = getattr(obj, name)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor(cursor)
+    try:
+        return [_field(model, name).to_python(value) for name, value in zip(fields, values)]
+    except Exception:
+        raise InvalidCursor(cursor)
+
+
+def _after(fields, values, descending):
+    #(a, b) > (x, y) is written as a >= x AND (a > x OR b > y) so the
+    #leading column always bounds an index range scan
+    strict = 'lt' if descending else 'gt'
+    loose = 'lte' if descending else 'gte'
+    name, value = fields[0], values[0]
+    if len(fields) == 1:
+        return Q(**{'%s__%s' % (name, strict): value})
+    rest = _after(fields[1:], values[1:], descending)
+    return Q(**{'%s__%s' % (name, loose): value}) & (Q(**{'%s__%s' % (name, strict): value}) | rest)
+
+
+def keyset_queryset(queryset, cursor, per_page, fields, descending=False):
+    """The rows after ``cursor``, ordered, plus one to tell if more follow."""
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, fields)
+        queryset = queryset.filter(_after(fields, values, descending))
+    ordering = ['-%s' % name if descending else name for name in fields]
+    return queryset.order_by(*ordering)[:per_page + 1]
+
+
+def keyset_page(queryset, cursor, per_page, fields, descending=False):
+    """Return (items, next_cursor) for the page following ``cursor``.
+
+    ``fields`` must uniquely order the queryset (end it with 'pk') and
+    should be covered by a composite index.
+    """
+    items = list(keyset_queryset(queryset, cursor, per_page, fields, descending))
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1], fields)
+    return items, next_cursor
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+_current = ContextVar('performance_sample', default=None)
+
+
+class Sample:
+    """Timings collected while one request is handled."""
+
+    def __init__(self):
+        self.view = None
+        self.wall = 0.0
+        self.queries = 0
+        self.sql = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+        self.size = None
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - start
+            self.queries += 1
+
+    def server_timing(self):
+        return 'total;dur=%.1f, sql;dur=%.1f;desc="%d queries", tpl;dur=%.1f' % (
+            self.wall * 1000, self.sql * 1000, self.queries, self.template * 1000)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[index]
+
+
+class Registry:
+    """The last ``window`` samples of each view, kept in this process."""
+
+    def __init__(self, window):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+
+    def add(self, sample):
+        with self.lock:
+            self.samples[sample.view].append(
+                (sample.wall, sample.queries, sample.sql, sample.template, sample.size))
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def report(self):
+        with self.lock:
+            samples = {view: list(values) for view, values in self.samples.items()}
+        rows = []
+        for view, values in sorted(samples.items()):
+            wall, queries, sql, template, size = zip(*values)
+            sizes = [s for s in size if s is not None]
+            rows.append({
+                'view': view,
+                'count': len(values),
+                'wall_p50': percentile(wall, 50) * 1000,
+                'wall_p95': percentile(wall, 95) * 1000,
+                'wall_p99': percentile(wall, 99) * 1000,
+                'queries_avg': sum(queries) / len(queries),
+                'queries_max': max(queries),
+                'sql_p95': percentile(sql, 95) * 1000,
+                'template_p95': percentile(template, 95) * 1000,
+                'size_avg': sum(sizes) / len(sizes) if sizes else None,
+            })
+        return rows
+
+
+registry = Registry(settings.PERFORMANCE_WINDOW)
+
+class TimedTemplate:
+    """A backend template whose renders count towards the current sample."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None:
+            return self.template.render(context, request)
+        #a template tag may render another template; only the outermost render is timed
+        sample.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            sample.template_depth -= 1
+            if not sample.template_depth:
+                sample.template += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing renders for PerformanceMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class PerformanceMiddleware:
+    """Record wall, SQL and template time plus response size per view.
+
+    Only views from ``settings.PERFORMANCE_APPS`` are kept in the registry;
+    every response still gets a ``Server-Timing`` header. Template time is
+    only measured with the ``TimedDjangoTemplates`` backend.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = Sample()
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample.execute))
+                response = self.get_response(request)
+        finally:
+            sample.wall = time.perf_counter() - start
+            _current.reset(token)
+        if not response.streaming:
+            sample.size = len(response.content)
+        response['Server-Timing'] = sample.server_timing()
+        if sample.view is not None:
+            registry.add(sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func.__module__.split('.')[0] in settings.PERFORMANCE_APPS:
+            match = request.resolver_match
+            _current.get().view = match.view_name or match.route
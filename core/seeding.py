@@ -0,0 +1,138 @@
+import io
+import random
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageDraw
+
+from blog import search
+from blog.models import Post, author_display_name
+from core.cache import invalidate
+from imaging import queue
+from imaging.hashing import content_hash, perceptual_hash
+from pictures.models import Picture
+
+WORDS = (
+    'idea talk stage speaker audience story change narrative school student community future science art '
+    'music design voice question answer learn build share listen open world city river light morning '
+    'project team volunteer event ticket workshop poster camera photo sponsor thank welcome together'
+).split()
+IMAGE_SIZES = ((1600, 1067), (1200, 1200), (1067, 1600), (800, 600))
+
+
+def render_image(seed):
+    """Draw one synthetic JPEG; runs in a worker process."""
+    rng = random.Random(seed)
+    width, height = rng.choice(IMAGE_SIZES)
+    image = Image.new('RGB', (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x, y = rng.randrange(width), rng.randrange(height)
+        box = [x, y, x + rng.randrange(50, width // 2), y + rng.randrange(50, height // 2)]
+        draw.rectangle(box, fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=80)
+    data = buffer.getvalue()
+    return {
+        'name': 'seed-%d.jpg' % seed,
+        'width': width,
+        'height': height,
+        'data': data,
+        'content_hash': content_hash([data]),
+        'phash': perceptual_hash(image),
+    }
+
+
+class Seeder:
+    """Synthetic users, posts and images, inserted one batch at a time.
+
+    Every random choice comes from ``seed``, so a dataset can be rebuilt
+    exactly. ``progress(message, count)`` is called after each batch.
+    """
+
+    def __init__(self, seed=0, batch_size=1000, derivatives=True, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.derivatives = derivatives
+        self.progress = progress or (lambda message, count: None)
+
+    def users(self, count):
+        User = get_user_model()
+        prefix = 'seed-%s-' % uuid.uuid4().hex[:8]
+        #hashing is deliberately slow, so every seeded user shares one hash of "password"
+        password = make_password('password')
+        User.objects.bulk_create(
+            [User(username='%s%d' % (prefix, i), password=password) for i in range(count)],
+            batch_size=self.batch_size)
+        self.progress('Created users', count)
+        return list(User.objects.filter(username__startswith=prefix))
+
+    def posts(self, count, authors):
+        if not count:
+            return
+        now = timezone.now()
+        for start in range(0, count, self.batch_size):
+            posts = [self.build_post(authors, now) for _ in range(min(self.batch_size, count - start))]
+            Post.objects.bulk_create(posts)
+            self.progress('Created posts', start + len(posts))
+        search.rebuild()
+        invalidate('blog')
+
+    def build_post(self, authors, now):
+        rng = self.rng
+        paragraphs = [' '.join(rng.choices(WORDS, k=rng.randint(20, 80))).capitalize() + '.'
+                      for _ in range(rng.randint(1, 6))]
+        roll = rng.random()
+        if roll < 0.03:
+            published_date = None
+        elif roll < 0.06:
+            published_date = now + timezone.timedelta(days=rng.uniform(1, 30))
+        else:
+            published_date = now - timezone.timedelta(days=rng.uniform(0, 1000))
+        author = rng.choice(authors)
+        post = Post(author=author, author_display_name=author_display_name(author),
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(2, 7))).title(),
+                    text='\n\n'.join(paragraphs), published_date=published_date)
+        post.update_status()
+        post.update_derived_fields()
+        return post
+
+    def images(self, model, count, map=map):
+        """Add ``count`` images drawn through ``map``, e.g. a process pool's."""
+        if not count:
+            return
+        seeds = [self.rng.randrange(2 ** 32) for _ in range(count)]
+        created = 0
+        batch = []
+        for result in map(render_image, seeds):
+            #bulk_create skips save(), so the dimensions come from the renderer
+            instance = model(description=' '.join(self.rng.choices(WORDS, k=4)).capitalize(),
+                             width=result['width'], height=result['height'])
+            content = ContentFile(result['data'])
+            content.content_hash = result['content_hash']
+            instance.image.save(result['name'], content, save=False)
+            if model is Picture:
+                instance.content_hash = result['content_hash']
+                instance.phash = result['phash']
+            batch.append(instance)
+            if len(batch) >= self.batch_size:
+                created += self.flush(model, batch)
+        created += self.flush(model, batch)
+        self.progress('Created %s' % model._meta.label, created)
+        invalidate(model._meta.app_label)
+
+    def flush(self, model, batch):
+        if not batch:
+            return 0
+        with transaction.atomic():
+            last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+            model.objects.bulk_create(batch)
+            if self.derivatives:
+                queue.enqueue_many(model, model.objects.filter(pk__gt=last).values_list('pk', flat=True))
+        count = len(batch)
+        batch.clear()
+        return count
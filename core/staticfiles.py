@@ -0,0 +1,90 @@
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+#strings and url() values are copied as they are; comments are dropped
+CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\))|/\*.*?\*/''', re.S | re.I)
+CSS_SPACE_RE = re.compile(r'\s+')
+#a space before ":" is significant in selectors ("a :hover"), so only strip after it
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*|:\s+')
+
+
+def _minify_code(css):
+    css = CSS_SPACE_RE.sub(' ', css)
+    css = CSS_PUNCTUATION_RE.sub(lambda m: m.group(1) or ':', css)
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    parts = []
+    position = 0
+    for match in CSS_TOKEN_RE.finditer(css):
+        parts.append(_minify_code(css[position:match.start()]))
+        parts.append(match.group(1) or '')
+        position = match.end()
+    parts.append(_minify_code(css[position:]))
+    return ''.join(parts).strip()
+
+
+def compress(path):
+    """Write .gz and, when brotli is installed, .br siblings of ``path``."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        #the front server falls back to the plain file when there is no sibling
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+
+
+class BundledManifestStorage(ManifestStaticFilesStorage):
+    """Fingerprinted static files with CSS bundles and precompressed copies.
+
+    ``collectstatic`` concatenates and minifies each ``STATIC_BUNDLES``
+    entry, hashes every file name as usual, then writes .gz/.br siblings of
+    the hashed text files so the front server never compresses on request.
+    """
+    compress_extensions = ('.css', '.js', '.svg', '.json', '.txt', '.xml')
+
+    @property
+    def builds_bundles(self):
+        return bool(self.hashed_files)
+
+    def stored_name(self, name):
+        #until collectstatic has written a manifest (a local run or tests with
+        #DEBUG off) link the plain files rather than fail every page; the
+        #core.W001 check reports it
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for bundle, sources in settings.STATIC_BUNDLES.items():
+                content = '\n'.join(minify_css(self.read_source(paths, source)) for source in sources)
+                if self.exists(bundle):
+                    self.delete(bundle)
+                self.save(bundle, ContentFile(content.encode()))
+                paths[bundle] = (self, bundle)
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            for name in set(self.hashed_files.values()):
+                if os.path.splitext(name)[1] in self.compress_extensions:
+                    compress(self.path(name))
+
+    def read_source(self, paths, name):
+        storage, path = paths[name]
+        with storage.open(path) as f:
+            return f.read().decode()
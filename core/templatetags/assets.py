@@ -0,0 +1,21 @@
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def css_bundle(name):
+    """Link a STATIC_BUNDLES stylesheet, or its sources when it is not built.
+
+    The bundle only exists after collectstatic with BundledManifestStorage;
+    in development each source file is linked as is.
+    """
+    if getattr(staticfiles_storage, 'builds_bundles', False):
+        urls = [static(name)]
+    else:
+        urls = [static(source) for source in settings.STATIC_BUNDLES[name]]
+    return format_html_join('\n', '<link rel="stylesheet" href="{}">', ((url,) for url in urls))
@@ -0,0 +1,14 @@
+import shutil
+import tempfile
+from django.test import override_settings
+
+class TemporaryMediaMixin:
+    """stores each test's uploads in a fresh MEDIA_ROOT that is deleted afterwards"""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=root)
+        media.enable()
+        self.addCleanup(media.disable)
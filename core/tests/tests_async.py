@@ -0,0 +1,81 @@
+import asyncio
+from io import StringIO
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import LiveServerTestCase, RequestFactory, TestCase, override_settings
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory, UserFactory
+from core.tests.media import TemporaryMediaMixin
+from core.views import public_page
+from pictures.tests.factories import PictureFactory
+from sponsors.tests.factories import SponsorFactory
+
+class AsgiViewsTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        author = UserFactory()
+        self.post = PostFactory(author=author, title="live", published_date=now() - timedelta(days=1))
+        self.draft = PostFactory(author=author, title="draft")
+        PictureFactory()
+        SponsorFactory()
+
+    async def test_post_list(self):
+        """under asgi the post list shows published posts only"""
+        response = await self.async_client.get(reverse("post_list"))
+        self.assertContains(response, "live")
+        self.assertNotContains(response, "draft")
+
+    async def test_post_detail(self):
+        """published posts render and drafts are hidden from anonymous users"""
+        response = await self.async_client.get(reverse("post_detail", kwargs={"pk": self.post.pk}))
+        self.assertContains(response, "live")
+        response = await self.async_client.get(reverse("post_detail", kwargs={"pk": self.draft.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_conditional_get(self):
+        """pages served over asgi answer conditional requests"""
+        response = await self.async_client.get(reverse("post_list"))
+        response = await self.async_client.get(reverse("post_list"), **{"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_galleries(self):
+        """homepage, pictures and sponsors render over asgi"""
+        for name in ("homepage", "pictures_page", "sponsors_page"):
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+
+class PublicPageTest(TestCase):
+    def build(self):
+        return public_page("blog/post_list.html")(lambda request: {"posts": [], "next_cursor": None})
+
+    def request(self, user):
+        request = RequestFactory().get("/blog/")
+        request.user = user
+        return request
+
+    def test_sync_under_wsgi(self):
+        """without ASYNC_VIEWS the view is plain sync code"""
+        view = self.build()
+        self.assertFalse(asyncio.iscoroutinefunction(view))
+        self.assertEqual(view(self.request(AnonymousUser())).status_code, 200)
+
+    @override_settings(ASYNC_VIEWS=True)
+    def test_async_under_asgi(self):
+        """with ASYNC_VIEWS the view is async and logged in copies are private"""
+        view = self.build()
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        response = async_to_sync(view)(self.request(UserFactory()))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+
+class LoadtestTest(LiveServerTestCase):
+    def test_report(self):
+        """every request against a running server is counted"""
+        out = StringIO()
+        call_command("loadtest", self.live_server_url, path=["/"], requests=4, concurrency=2, client_delay=0,
+                     stdout=out)
+        self.assertRegex(out.getvalue().splitlines()[1], r"^\s+4\s+0\s")
@@ -0,0 +1,50 @@
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from core import benchmark
+from core.management import default_host
+from core.management.commands import audit_query_plans
+from core.tests.media import TemporaryMediaMixin
+
+class AuditQueryPlansTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        benchmark.seed(posts=10, pictures=3, sponsors=3)
+
+    def test_hot_queries_use_indexes(self):
+        """every page, feed, api and worker query is served from an index"""
+        out = StringIO()
+        call_command("audit_query_plans", stdout=out)
+        self.assertIn("post_list:", out.getvalue())
+        self.assertIn("process_image_jobs:", out.getvalue())
+
+    def test_scan_fails(self):
+        """a full scan outside the allow-list fails the audit"""
+        out = StringIO()
+        with mock.patch.object(audit_query_plans, "ALLOWED_SCANS", {}):
+            with self.assertRaisesMessage(CommandError, "sponsors_page"):
+                call_command("audit_query_plans", stdout=out)
+            self.assertIn("scans sponsors_sponsors", out.getvalue())
+            call_command("audit_query_plans", allow_scan=["sponsors_sponsors"], stdout=StringIO())
+
+    def test_index_scans(self):
+        """walking a whole index is a scan unless a limit stops it"""
+        scans = audit_query_plans.Command().scans
+        plan = ["SCAN blog_post USING COVERING INDEX blog_post_status_idx"]
+        self.assertEqual(list(scans("SELECT COUNT(*) FROM blog_post", plan)), ["blog_post"])
+        self.assertEqual(list(scans("SELECT id FROM blog_post ORDER BY id LIMIT 21", plan)), [])
+        plan.append("USE TEMP B-TREE FOR ORDER BY")
+        self.assertEqual(list(scans("SELECT id FROM blog_post ORDER BY title LIMIT 21", plan)), ["blog_post"])
+        self.assertEqual(list(scans("SELECT id FROM blog_post", ["SEARCH blog_post USING INDEX x (status=?)"])), [])
+
+    def test_default_host(self):
+        """the host comes from ALLOWED_HOSTS when the command runs"""
+        with override_settings(ALLOWED_HOSTS=[".example.com"]):
+            self.assertEqual(default_host(), "example.com")
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            self.assertEqual(default_host(), "localhost")
+            call_command("audit_query_plans", stdout=StringIO())
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from core import benchmark
+from core.tests.media import TemporaryMediaMixin
+
+class QueryCeilingTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def queries(self):
+        with benchmark.without_page_cache():
+            return {name: benchmark.measure(url, 1)["queries"] for name, url in benchmark.pages()}
+
+    def test_ceilings(self):
+        """no page goes over its query ceiling"""
+        benchmark.seed(posts=15, pictures=5, sponsors=3)
+        for name, count in self.queries().items():
+            with self.subTest(page=name):
+                self.assertLessEqual(count, benchmark.QUERY_CEILINGS[name])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """pages run the same queries with three or thirty rows each"""
+        benchmark.seed(posts=3, pictures=3, sponsors=3)
+        small = self.queries()
+        benchmark.seed(posts=30, pictures=30, sponsors=30)
+        self.assertEqual(self.queries(), small)
+
+    def test_error_status(self):
+        """a page that does not answer 200 stops the measurement"""
+        with self.assertRaisesMessage(RuntimeError, "returned 404"):
+            benchmark.measure("/missing/", 1)
+
+class BenchmarkViewsTest(TemporaryMediaMixin, TestCase):
+    def test_report(self):
+        """the command seeds rows and writes a json report for every page"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.json")
+            call_command("benchmark_views", seed=True, posts=5, pictures=2, sponsors=2,
+                         requests=3, output=path, stdout=StringIO())
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(set(report), set(benchmark.QUERY_CEILINGS))
+        for result in report.values():
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["peak_memory_kb"], 0)
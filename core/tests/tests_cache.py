@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.models import Post
+from blog.tests.factories import PostFactory, UserFactory
+from pictures.tests.factories import PictureFactory
+from core.tests.media import TemporaryMediaMixin
+
+class PageCacheTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse("post_list")
+
+    def test_anonymous_hits_cache(self):
+        """a second anonymous request only runs the conditional GET validator query"""
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_authenticated_bypasses_cache(self):
+        UserFactory(username="staff", password="testpassword")
+        self.assertTrue(self.client.login(username="staff", password="testpassword"))
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context)
+
+    def test_save_invalidates(self):
+        """publishing a post shows up on the next anonymous request"""
+        self.client.get(self.url)
+        PostFactory(published_date=now() - timedelta(minutes=1), text="fresh")
+        self.assertIn("fresh", self.client.get(self.url).content.decode("utf-8"))
+
+    def test_delete_invalidates(self):
+        post = PostFactory(published_date=now() - timedelta(minutes=1), text="stale")
+        self.client.get(self.url)
+        post.delete()
+        self.assertNotIn("stale", self.client.get(self.url).content.decode("utf-8"))
+
+    def test_scheduled_post_appears(self):
+        """publishing a due scheduled post invalidates the cached list"""
+        post = PostFactory(published_date=now() + timedelta(hours=1), text="scheduled")
+        self.assertNotIn("scheduled", self.client.get(self.url).content.decode("utf-8"))
+        Post.objects.filter(pk=post.pk).update(published_date=now() - timedelta(minutes=1))
+        self.assertNotIn("scheduled", self.client.get(self.url).content.decode("utf-8"))
+        Post.publish_due()
+        self.assertIn("scheduled", self.client.get(self.url).content.decode("utf-8"))
+
+    def test_namespaces_are_independent(self):
+        """saving a picture leaves cached blog pages alone"""
+        self.client.get(self.url)
+        PictureFactory()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
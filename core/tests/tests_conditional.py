@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory
+from pictures.tests.factories import PictureFactory
+from sponsors.tests.factories import SponsorFactory
+from core.models import ChangeMarker
+from core.tests.media import TemporaryMediaMixin
+
+class ConditionalGetTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.post = PostFactory(published_date=now() - timedelta(days=1))
+
+    def assertRevalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def test_post_list(self):
+        etag = self.assertRevalidates(reverse("post_list"))
+        PostFactory(published_date=now() - timedelta(hours=1))
+        response = self.client.get(reverse("post_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_list_if_modified_since(self):
+        response = self.client.get(reverse("post_list"))
+        response = self.client.get(reverse("post_list"), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def assertModifiedBy(self, url, change):
+        #Last-Modified has one second resolution, so start from an older change
+        ChangeMarker.objects.update(changed_at=now() - timedelta(hours=1))
+        last_modified = self.client.get(url)["Last-Modified"]
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+    def test_post_list_unpublish_moves_last_modified(self):
+        """unpublishing or deleting the newest post is a change, though no visible row is newer"""
+        newest = PostFactory(published_date=now() - timedelta(hours=1))
+        newest.published_date = None
+        self.assertModifiedBy(reverse("post_list"), newest.save)
+        self.assertModifiedBy(reverse("post_list"), self.post.delete)
+
+    def test_post_detail(self):
+        url = reverse("post_detail", kwargs={"pk": self.post.pk})
+        etag = self.assertRevalidates(url)
+        self.post.title = "edited"
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unpublished_post_stays_hidden(self):
+        """a matching etag never turns a hidden post into a 304"""
+        post = PostFactory(published_date=now() + timedelta(days=1))
+        url = reverse("post_detail", kwargs={"pk": post.pk})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+    def test_pictures_page(self):
+        PictureFactory()
+        etag = self.assertRevalidates(reverse("pictures_page"))
+        PictureFactory()
+        response = self.client.get(reverse("pictures_page"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_sponsors_page(self):
+        sponsor = SponsorFactory()
+        etag = self.assertRevalidates(reverse("sponsors_page"))
+        sponsor.delete()
+        response = self.client.get(reverse("sponsors_page"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory
+from core.export import SiteExporter
+
+class ExportSiteTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        self.yest = now() - timedelta(days=1)
+
+    def export(self, **kwargs):
+        exporter = SiteExporter(self.output, "127.0.0.1", **kwargs)
+        exporter.run()
+        return exporter
+
+    def read(self, *parts):
+        with open(os.path.join(self.output, *parts, "index.html")) as f:
+            return f.read()
+
+    def test_exports_public_pages(self):
+        post = PostFactory(published_date=self.yest, title="exported")
+        PostFactory(published_date=now() + timedelta(days=1), title="scheduled")
+        exporter = self.export()
+        self.assertEqual(len(exporter.rendered), 5)
+        self.assertIn("exported", self.read("blog", "post", str(post.pk)))
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "post", str(post.pk + 1))))
+        self.assertIn("TEDxATHS", self.read())
+
+    def test_hashed_assets(self):
+        self.export()
+        html = self.read("blog")
+        self.assertNotIn('href="/static/css/root.css"', html)
+        css = [name for name in os.listdir(os.path.join(self.output, "static", "css")) if name.startswith("root.")]
+        self.assertEqual(len(css), 1)
+        self.assertIn("/static/css/%s" % css[0], html)
+
+    @override_settings(BLOG_POSTS_PER_PAGE=1)
+    def test_cursor_pages(self):
+        """list pages reached by cursor links are exported as paths"""
+        PostFactory(published_date=self.yest)
+        PostFactory(published_date=self.yest)
+        self.export()
+        html = self.read("blog")
+        self.assertNotIn("?after=", html)
+        link = html.split('href="/blog/after/')[1].split('"')[0]
+        self.assertTrue(os.path.exists(os.path.join(self.output, "blog", "after", link, "index.html")))
+
+    def test_incremental(self):
+        """a second export only re-renders pages whose rows changed"""
+        post = PostFactory(published_date=self.yest)
+        other = PostFactory(published_date=self.yest)
+        self.export()
+        self.assertEqual(self.export().rendered, [])
+        post.title = "edited"
+        post.save()
+        exporter = self.export()
+        self.assertEqual(sorted(exporter.rendered), ["/blog/", "/blog/post/%d/" % post.pk])
+        other_pk = other.pk
+        other.delete()
+        exporter = self.export()
+        self.assertEqual(exporter.removed, ["/blog/post/%d/" % other_pk])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "post", str(other_pk))))
+
+    def test_full(self):
+        self.export()
+        self.assertEqual(len(self.export(full=True).rendered), 4)
@@ -0,0 +1,31 @@
+from django.test import TestCase
+from django.utils.timezone import now, timedelta
+from blog.models import Post
+from blog.tests.factories import PostFactory
+from core.pagination import keyset_page, decode_cursor, InvalidCursor
+
+class KeysetPageTest(TestCase):
+    def test_ties_are_broken_by_pk(self):
+        """posts sharing a published_date are neither skipped nor repeated"""
+        when = now() - timedelta(days=1)
+        posts = [PostFactory(published_date=when) for i in range(5)]
+        seen, cursor = [], None
+        while True:
+            items, cursor = keyset_page(Post.objects.all(), cursor, 2, ('published_date', 'pk'))
+            seen += items
+            if cursor is None:
+                break
+        self.assertEqual(seen, posts)
+
+    def test_descending(self):
+        base = now() - timedelta(days=10)
+        posts = [PostFactory(published_date=base + timedelta(days=i)) for i in range(3)]
+        items, cursor = keyset_page(Post.objects.all(), None, 2, ('published_date', 'pk'), descending=True)
+        self.assertEqual(items, posts[:0:-1])
+        items, cursor = keyset_page(Post.objects.all(), cursor, 2, ('published_date', 'pk'), descending=True)
+        self.assertEqual(items, posts[:1])
+
+    def test_invalid_cursor(self):
+        for cursor in ["garbage", "WyJ4Il0", "WyJub3QgYSBkYXRlIiwxXQ"]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, Post, ('published_date', 'pk'))
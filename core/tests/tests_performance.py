@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template.base import Template
+from django.test import TestCase, modify_settings, override_settings
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory, UserFactory
+from core.performance import PerformanceMiddleware, registry
+
+TIMED_TEMPLATES = [dict(settings.TEMPLATES[0], BACKEND="core.performance.TimedDjangoTemplates")]
+
+@modify_settings(MIDDLEWARE={"prepend": "core.performance.PerformanceMiddleware"})
+@override_settings(TEMPLATES=TIMED_TEMPLATES)
+class PerformanceMiddlewareTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        registry.clear()
+
+    def test_server_timing(self):
+        """responses carry total, sql and template timings"""
+        PostFactory(author=UserFactory(), published_date=now() - timedelta(days=1))
+        response = self.client.get(reverse("post_list"))
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^total;dur=[\d.]+, sql;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+$')
+
+    def test_records_view(self):
+        """site views are added to the histogram with their query count and size"""
+        self.client.get(reverse("post_list"))
+        self.client.get(reverse("post_list"))
+        [row] = registry.report()
+        self.assertEqual(row["view"], "post_list")
+        self.assertEqual(row["count"], 2)
+        self.assertGreater(row["queries_max"], 0)
+        self.assertGreater(row["template_p95"], 0)
+        self.assertGreater(row["size_avg"], 0)
+
+    def test_leaves_templates_alone(self):
+        """creating the middleware does not patch template rendering"""
+        render = Template.render
+        PerformanceMiddleware(lambda request: None)
+        self.assertIs(Template.render, render)
+
+    def test_ignores_other_apps(self):
+        """admin requests get a header but are not recorded"""
+        response = self.client.get(reverse("admin:login"))
+        self.assertIn("Server-Timing", response)
+        self.assertEqual(registry.report(), [])
+
+    def test_report_is_staff_only(self):
+        """the report redirects anonymous users and renders for staff"""
+        self.client.get(reverse("homepage"))
+        response = self.client.get(reverse("performance_report"))
+        self.assertEqual(response.status_code, 302)
+        self.client.force_login(UserFactory(is_staff=True))
+        response = self.client.get(reverse("performance_report"))
+        self.assertContains(response, "homepage")
@@ -0,0 +1,55 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from blog import search
+from blog.models import Post
+from imaging.models import ImageJob
+from pictures.models import Picture
+from sponsors.models import Sponsors
+from core.tests.media import TemporaryMediaMixin
+
+class SeedDataTest(TemporaryMediaMixin, TestCase):
+    def seed(self, **options):
+        options = dict(dict(users=3, posts=40, pictures=3, sponsors=2, batch_size=16, workers=0), **options)
+        call_command("seed_data", stdout=StringIO(), **options)
+
+    def test_counts(self):
+        """the requested number of rows is created in batches"""
+        self.seed()
+        self.assertEqual(get_user_model().objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 40)
+        self.assertEqual(Picture.objects.count(), 3)
+        self.assertEqual(Sponsors.objects.count(), 2)
+        self.assertEqual(ImageJob.objects.count(), 5)
+
+    def test_users_share_a_usable_password(self):
+        """seeded users can log in with the shared password"""
+        self.seed(posts=0, pictures=0, sponsors=0)
+        user = get_user_model().objects.first()
+        self.assertTrue(user.check_password("password"))
+
+    def test_posts_are_complete(self):
+        """seeded posts have derived fields, a status and a search entry"""
+        self.seed(pictures=0, sponsors=0)
+        self.assertFalse(Post.objects.filter(excerpt="").exists())
+        self.assertFalse(Post.objects.filter(text_hash="").exists())
+        post = Post.objects.published().first()
+        results, has_next = search.search(post.title.split()[0])
+        self.assertTrue(results)
+
+    def test_images(self):
+        """images are stored with their dimensions and hashes"""
+        self.seed(posts=0, no_derivatives=True)
+        picture = Picture.objects.first()
+        self.assertTrue(picture.width and picture.height)
+        self.assertEqual(len(picture.content_hash), 64)
+        self.assertEqual(ImageJob.objects.count(), 0)
+
+    def test_repeatable(self):
+        """the same seed gives the same posts"""
+        self.seed(pictures=0, sponsors=0, seed=7)
+        first = list(Post.objects.order_by("pk").values_list("title", flat=True))
+        Post.objects.all().delete()
+        self.seed(pictures=0, sponsors=0, seed=7)
+        self.assertEqual(list(Post.objects.order_by("pk").values_list("title", flat=True)), first)
@@ -0,0 +1,72 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from core import checks
+from core.checks import check_brotli, check_static_manifest
+from core.staticfiles import minify_css
+
+class MinifyCssTest(SimpleTestCase):
+    def test_minify(self):
+        """comments, whitespace and trailing semicolons are dropped"""
+        css = "/* header */\n.a > b,\n.c :hover {\n    color: #fff;\n    margin: 0 auto;\n}\n"
+        self.assertEqual(minify_css(css), ".a>b,.c :hover{color:#fff;margin:0 auto}")
+
+    def test_strings_and_urls_untouched(self):
+        """strings and url() values keep their spaces, punctuation and comment-like text"""
+        css = '.q::before {\n  content: "a ,  b; } /* x */";\n  background: url( "img/a  b.png" ) ;\n}\n.u { background: url(data:image/svg+xml;utf8,<svg a=\'1\'> </svg>) }'
+        self.assertEqual(minify_css(css), '.q::before{content:"a ,  b; } /* x */";background:url( "img/a  b.png" )}'
+                                          ".u{background:url(data:image/svg+xml;utf8,<svg a='1'> </svg>)}")
+
+class StaticManifestCheckTest(SimpleTestCase):
+    def test_missing_manifest(self):
+        """the manifest storage without a collectstatic run is a check error"""
+        with tempfile.TemporaryDirectory() as root:
+            with override_settings(STATIC_ROOT=root, STATICFILES_STORAGE="core.staticfiles.BundledManifestStorage"):
+                self.assertEqual([warning.id for warning in check_static_manifest(None)], ["core.W001"])
+                call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+                self.assertEqual(check_static_manifest(None), [])
+
+    def test_missing_brotli(self):
+        with override_settings(STATICFILES_STORAGE="core.staticfiles.BundledManifestStorage"):
+            with mock.patch.object(checks, "brotli", None):
+                self.assertEqual([warning.id for warning in check_brotli(None)], ["core.W002"])
+            with mock.patch.object(checks, "brotli", object()):
+                self.assertEqual(check_brotli(None), [])
+
+class CssBundleTest(SimpleTestCase):
+    def render(self):
+        return Template("{% load assets %}{% css_bundle 'css/site.css' %}").render(Context())
+
+    def test_development(self):
+        """without a build every source stylesheet is linked"""
+        html = self.render()
+        for source in ("css/root.css", "css/pic.css", "css/sponsors.css"):
+            self.assertIn('href="/static/%s"' % source, html)
+
+    def test_without_manifest(self):
+        """before collectstatic the manifest storage links the plain sources instead of failing"""
+        with tempfile.TemporaryDirectory() as root:
+            with override_settings(STATIC_ROOT=root, STATICFILES_STORAGE="core.staticfiles.BundledManifestStorage"):
+                self.assertIn('href="/static/css/root.css"', self.render())
+
+    def test_collectstatic(self):
+        """collectstatic writes a fingerprinted, minified, precompressed bundle"""
+        with tempfile.TemporaryDirectory() as root:
+            with override_settings(STATIC_ROOT=root, STATICFILES_STORAGE="core.staticfiles.BundledManifestStorage"):
+                call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+                with open(os.path.join(root, "staticfiles.json")) as f:
+                    hashed = json.load(f)["paths"]["css/site.css"]
+                self.assertRegex(hashed, r"^css/site\.[0-9a-f]{12}\.css$")
+                with open(os.path.join(root, hashed), "rb") as f:
+                    bundle = f.read()
+                self.assertIn(b".sponsors{", bundle)
+                self.assertNotIn(b"\n    ", bundle)
+                with gzip.open(os.path.join(root, hashed + ".gz")) as f:
+                    self.assertEqual(f.read(), bundle)
+                self.assertEqual(self.render(), '<link rel="stylesheet" href="/static/%s">' % hashed)
@@ -0,0 +1,40 @@
+from io import StringIO
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.utils.timezone import now, timedelta
+from blog.tests.factories import PostFactory, UserFactory
+
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caches["template_fragments"].clear()
+
+    def test_header_nav_is_cached(self):
+        """the header nav is rendered once and then served from the fragment cache"""
+        key = make_template_fragment_key("site_nav")
+        self.assertIsNone(caches["template_fragments"].get(key))
+        response = self.client.get(reverse("post_list"))
+        self.assertContains(response, reverse("sponsors_page"))
+        self.assertIn(reverse("pictures_page"), caches["template_fragments"].get(key))
+
+    def test_icons_are_included(self):
+        """svg icons are plain includes, the cached loader already parses them once"""
+        post = PostFactory(author=UserFactory(), published_date=now() - timedelta(days=1))
+        response = self.client.get(reverse("post_detail", kwargs={"pk": post.pk}))
+        self.assertContains(response, "<svg", count=2)
+        self.assertIsNone(caches["template_fragments"].get(make_template_fragment_key("icon_pencil_fill")))
+
+class BenchmarkTemplatesTest(TestCase):
+    def test_reports_every_page(self):
+        """the benchmark prints before and after timings for each page"""
+        post = PostFactory(author=UserFactory(), published_date=now() - timedelta(days=1))
+        out = StringIO()
+        call_command("benchmark_templates", requests=1, stdout=out)
+        output = out.getvalue()
+        for url in ("/", reverse("post_list"), reverse("pictures_page"), reverse("sponsors_page"),
+                    reverse("post_detail", kwargs={"pk": post.pk})):
+            self.assertRegex(output, r"(?m)^%s\s+[\d.]+\s+[\d.]+\s+[\d.]+x$" % url)
@@ -0,0 +1,49 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+
+from .performance import registry
+
+
+@staff_member_required
+def performance_report(request):
+    context = dict(admin.site.each_context(request), title='Performance', rows=registry.report(),
+                   window=registry.window,
+                   enabled='core.performance.PerformanceMiddleware' in settings.MIDDLEWARE)
+    return render(request, 'core/performance.html', context)
+
+
+def public_page(template_name):
+    """Turn ``load(request, *args, **kwargs)``, which returns a context, into a view.
+
+    WSGI gets a plain sync view. Under ASGI (``settings.ASYNC_VIEWS``, set
+    by mysite.asgi) the view is async: ``load`` and ``request.user`` run in
+    a thread, since the ORM is sync only, and the template renders on the
+    event loop. A logged in user's copy is always private.
+    """
+    def decorator(load):
+        def prepare(request, *args, **kwargs):
+            return load(request, *args, **kwargs), request.user.is_authenticated
+
+        def respond(request, context, authenticated):
+            response = render(request, template_name, context)
+            if authenticated:
+                patch_cache_control(response, private=True)
+            return response
+
+        if settings.ASYNC_VIEWS:
+            @wraps(load)
+            async def async_view(request, *args, **kwargs):
+                return respond(request, *await sync_to_async(prepare)(request, *args, **kwargs))
+            return async_view
+
+        @wraps(load)
+        def view(request, *args, **kwargs):
+            return respond(request, *prepare(request, *args, **kwargs))
+        return view
+    return decorator
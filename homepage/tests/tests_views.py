@@ -1,9 +1,11 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.shortcuts import reverse
 
 class HomepageTest(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("homepage")
 
     def test_nothingshows(self):
@@ -1,6 +1,10 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.shortcuts import redirect
+from core.cache import cache_public_page
+from core.views import public_page
 
-def homepage (request):
-    return render(request, 'homepage/homepage.html', {}) 
\ No newline at end of file
+@cache_public_page()
+@public_page('homepage/homepage.html')
+def homepage(request):
+    return {}
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import ImageJob
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'attempts', 'created_at', 'updated_at')
+    list_filter = ('status', 'content_type')
+    readonly_fields = ('content_type', 'object_id', 'attempts', 'error', 'created_at', 'updated_at')
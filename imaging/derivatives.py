@@ -0,0 +1,146 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+EXIF_ORIENTATION = 0x0112
+
+#(PIL format, extension, mime type), best first; JPEG is always available
+FORMATS = (
+    ('AVIF', 'avif', 'image/avif'),
+    ('WEBP', 'webp', 'image/webp'),
+    ('JPEG', 'jpg', 'image/jpeg'),
+)
+
+
+def available_formats():
+    formats = []
+    for name, ext, mime in FORMATS:
+        if name == 'WEBP' and not features.check('webp'):
+            continue
+        if name not in Image.SAVE:
+            continue
+        formats.append((name, ext, mime))
+    return formats
+
+
+def is_stale(field_file, derivatives):
+    if not field_file:
+        return False
+    return (derivatives or {}).get('source') != field_file.name
+
+
+def target_widths(width):
+    #never upscale; an image narrower than every target gets one copy at its own width
+    return sorted({min(target, width) for target in settings.IMAGE_DERIVATIVE_WIDTHS})
+
+
+def _prepare(image, format_name):
+    if format_name == 'JPEG' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    return image
+
+
+def render_derivatives(source, name):
+    """Resize ``source`` (a file object) into every width and format.
+
+    Returns (width, height, color, [(name, width, height, format, mime, bytes)]).
+    Pure image work with no database access, so it can run in a worker
+    process.
+    """
+    image = Image.open(source)
+    rotated = image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+    width, height = image.size[::-1] if rotated else image.size
+    largest = target_widths(width)[-1]
+    #let the JPEG decoder downscale while decoding when every target is much smaller
+    scaled = (largest, max(1, round(height * largest / width)))
+    image.draft('RGB', scaled[::-1] if rotated else scaled)
+    image = ImageOps.exif_transpose(image)
+    widths = target_widths(width)
+    stem = os.path.splitext(name)[0]
+    outputs = []
+    color = None
+    for target in widths:
+        size = (target, max(1, round(image.size[1] * target / image.size[0])))
+        resized = image if size == image.size else image.resize(size, Image.LANCZOS)
+        if color is None:
+            color = dominant_color(resized)
+        for format_name, ext, mime in available_formats():
+            buffer = io.BytesIO()
+            _prepare(resized, format_name).save(buffer, format_name, quality=settings.IMAGE_DERIVATIVE_QUALITY)
+            outputs.append(('derivatives/%s-%dw.%s' % (stem, target, ext), size[0], size[1], format_name, mime, buffer.getvalue()))
+    return width, height, color, outputs
+
+
+def dominant_color(image):
+    """Average colour as #rrggbb, painted behind an image while it loads."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = _prepare(image, 'JPEG')
+    return '#%02x%02x%02x' % image.convert('RGB').resize((1, 1), Image.BOX).getpixel((0, 0))
+
+
+def store_derivatives(field_file, rendered):
+    """Write rendered derivatives to the field's storage and describe them."""
+    width, height, color, outputs = rendered
+    storage = field_file.storage
+    images = []
+    for name, w, h, format_name, mime, data in outputs:
+        if storage.exists(name):
+            storage.delete(name)
+        images.append({
+            'name': storage.save(name, ContentFile(data)),
+            'width': w,
+            'height': h,
+            'format': format_name,
+            'type': mime,
+        })
+    return {'source': field_file.name, 'width': width, 'height': height, 'color': color, 'images': images}
+
+
+def build_derivatives(field_file):
+    with field_file.open('rb') as source:
+        rendered = render_derivatives(source, field_file.name)
+    return store_derivatives(field_file, rendered)
+
+
+def delete_derivatives(storage, derivatives):
+    for image in (derivatives or {}).get('images', []):
+        storage.delete(image['name'])
+
+
+def refresh(instance, field='image', force=False):
+    """Regenerate derivatives for ``instance`` if its image changed."""
+    field_file = getattr(instance, field)
+    if not force and not is_stale(field_file, instance.derivatives):
+        return False
+    old = apply(instance, build_derivatives(field_file))
+    discard_replaced(field_file.storage, old, instance.derivatives)
+    instance.save(update_fields=UPDATE_FIELDS)
+    return True
+
+
+#updated_at too: the page's srcset, and so its ETag, change with the derivatives
+UPDATE_FIELDS = ['derivatives', 'placeholder_color', 'updated_at']
+
+
+def apply(instance, derivatives):
+    """Set freshly built derivatives on ``instance``; returns the old ones."""
+    old = instance.derivatives
+    instance.derivatives = derivatives
+    instance.placeholder_color = derivatives.get('color') or ''
+    return old
+
+
+def discard_replaced(storage, old, new):
+    kept = {image['name'] for image in new['images']}
+    delete_derivatives(storage, {'images': [
+        image for image in (old or {}).get('images', []) if image['name'] not in kept]})
@@ -0,0 +1,35 @@
+import hashlib
+
+from PIL import Image
+
+
+def content_hash(chunks):
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_hash(field_file):
+    #uploads streamed through StreamingUploadHandler were hashed as they arrived
+    if not field_file._committed and getattr(field_file.file, 'content_hash', None):
+        return field_file.file.content_hash
+    #reading dimensions may have closed the upload; open() rewinds or reopens it
+    field_file.open('rb')
+    try:
+        return content_hash(field_file.chunks())
+    finally:
+        field_file.seek(0)
+
+
+def perceptual_hash(image, size=8):
+    """64-bit difference hash: survives re-encoding and resizing of the same photo."""
+    image.draft('L', (size * 8, size * 8))
+    pixels = list(image.convert('L').resize((size + 1, size), Image.BILINEAR).getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return '%0*x' % (size * size // 4, bits)
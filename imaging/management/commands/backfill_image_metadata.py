@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from PIL import Image
+
+from imaging import derivatives
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+
+class Command(BaseCommand):
+    help = 'Fill in stored dimensions and placeholder colours for existing images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recompute rows that already have metadata')
+
+    def handle(self, *args, **options):
+        for model in (Picture, Sponsors):
+            rows = model.objects.all()
+            if not options['force']:
+                rows = rows.filter(Q(width__isnull=True) | Q(height__isnull=True) | Q(placeholder_color=''))
+            updated = 0
+            for instance in rows.iterator():
+                try:
+                    #reads only the image header
+                    instance.width, instance.height = instance.image.width, instance.image.height
+                    if instance.width is None:
+                        raise ValueError('not a readable image')
+                    instance.placeholder_color = (instance.derivatives or {}).get('color') or self.color(instance.image)
+                except (OSError, ValueError) as exc:
+                    self.stderr.write('%s %s: %s' % (model.__name__, instance.pk, exc))
+                    continue
+                instance.save(update_fields=['width', 'height', 'placeholder_color', 'updated_at'])
+                updated += 1
+            self.stdout.write(self.style.SUCCESS('%s: updated %d images' % (model.__name__, updated)))
+
+    def color(self, field_file):
+        with field_file.open('rb') as f:
+            image = Image.open(f)
+            image.draft('RGB', (64, 64))
+            image.thumbnail((64, 64))
+            return derivatives.dominant_color(image)
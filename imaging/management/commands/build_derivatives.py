@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from imaging import derivatives
+from pictures.models import Picture
+from sponsors.models import Sponsors
+
+
+class Command(BaseCommand):
+    help = 'Generate resized image derivatives for pictures and sponsors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate even if derivatives are up to date')
+
+    def handle(self, *args, **options):
+        for model in (Picture, Sponsors):
+            built = 0
+            for instance in model.objects.iterator():
+                try:
+                    built += derivatives.refresh(instance, force=options['force'])
+                except (OSError, ValueError) as exc:
+                    self.stderr.write('%s %s: %s' % (model.__name__, instance.pk, exc))
+            self.stdout.write(self.style.SUCCESS('%s: built derivatives for %d images' % (model.__name__, built)))
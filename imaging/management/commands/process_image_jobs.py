@@ -0,0 +1,42 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from imaging import queue
+
+
+class Command(BaseCommand):
+    help = 'Process queued image jobs using a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Worker processes; 0 renders in this process')
+        parser.add_argument('--batch-size', type=int, default=settings.IMAGE_JOB_BATCH_SIZE)
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when idle')
+        parser.add_argument('--stale-after', type=int, default=30,
+                            help='Minutes after which a running job is assumed abandoned')
+
+    def handle(self, *args, **options):
+        requeued = queue.requeue_stale(options['stale_after'])
+        if requeued:
+            self.stdout.write('Requeued %d abandoned jobs' % requeued)
+        executor = queue.executor(options['workers'])
+        processed = 0
+        try:
+            while True:
+                count = queue.run_batch(executor, options['batch_size'])
+                processed += count
+                if count:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(self.style.SUCCESS('Processed %d jobs' % processed))
@@ -0,0 +1,135 @@
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from . import derivatives
+from .models import ImageJob
+
+
+def enqueue(instance):
+    content_type = ContentType.objects.get_for_model(instance)
+    job, created = ImageJob.objects.get_or_create(
+        content_type=content_type, object_id=instance.pk, status=ImageJob.PENDING)
+    return job
+
+
+def enqueue_many(model, pks):
+    #bulk_create skips post_save, so bulk imports queue their own jobs
+    content_type = ContentType.objects.get_for_model(model)
+    return ImageJob.objects.bulk_create([ImageJob(content_type=content_type, object_id=pk) for pk in pks])
+
+
+def track(model):
+    """Keep ``model``'s derivatives in step with its ``image`` field."""
+    def queue_derivatives(sender, instance, **kwargs):
+        #resizing runs in the process_image_jobs worker so uploads return immediately
+        if derivatives.is_stale(instance.image, instance.derivatives):
+            enqueue(instance)
+
+    def delete_derivatives(sender, instance, **kwargs):
+        derivatives.delete_derivatives(instance.image.storage, instance.derivatives)
+
+    uid = 'derivatives:%s' % model._meta.label
+    post_save.connect(queue_derivatives, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(delete_derivatives, sender=model, weak=False, dispatch_uid=uid)
+
+
+def requeue_stale(minutes):
+    """Hand jobs left running by a crashed worker back to the queue."""
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return ImageJob.objects.filter(status=ImageJob.RUNNING, updated_at__lt=cutoff).update(
+        status=ImageJob.PENDING, updated_at=timezone.now())
+
+
+def claim(limit):
+    ids = ImageJob.objects.filter(status=ImageJob.PENDING).order_by('created_at').values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in list(ids):
+        #another worker may have taken it since the select
+        if ImageJob.objects.filter(pk=pk, status=ImageJob.PENDING).update(
+                status=ImageJob.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now()):
+            claimed.append(pk)
+    return list(ImageJob.objects.filter(pk__in=claimed).select_related('content_type'))
+
+
+def _source(field_file):
+    try:
+        return field_file.path
+    except NotImplementedError:
+        with field_file.open('rb') as source:
+            return source.read()
+
+
+def _render(source, name):
+    if isinstance(source, bytes):
+        return derivatives.render_derivatives(io.BytesIO(source), name)
+    with open(source, 'rb') as f:
+        return derivatives.render_derivatives(f, name)
+
+
+def _finish(job, status, error=''):
+    if status == ImageJob.FAILED and job.attempts < settings.IMAGE_JOB_MAX_ATTEMPTS:
+        status = ImageJob.PENDING
+    ImageJob.objects.filter(pk=job.pk).update(status=status, error=error, updated_at=timezone.now())
+
+
+def _store(job, name, rendered):
+    with transaction.atomic():
+        instance = job.content_type.model_class().objects.select_for_update().filter(pk=job.object_id).first()
+        #skip results for an image that was deleted or replaced while rendering
+        if instance is None or instance.image.name != name:
+            return
+        old = derivatives.apply(instance, derivatives.store_derivatives(instance.image, rendered))
+        instance.save(update_fields=derivatives.UPDATE_FIELDS)
+    derivatives.discard_replaced(instance.image.storage, old, instance.derivatives)
+
+
+def run_batch(executor=None, limit=None):
+    """Claim up to ``limit`` jobs and process them, in ``executor`` if given.
+
+    Decoding and encoding run in the executor; reads and writes of the
+    database and storage stay in this process.
+    """
+    jobs = claim(limit or settings.IMAGE_JOB_BATCH_SIZE)
+    pending = {}
+    for job in jobs:
+        instance = job.target
+        if instance is None or not derivatives.is_stale(instance.image, instance.derivatives):
+            _finish(job, ImageJob.DONE)
+            continue
+        name = instance.image.name
+        try:
+            source = _source(instance.image)
+            if executor is None:
+                _complete(job, name, lambda: _render(source, name))
+            else:
+                pending[executor.submit(_render, source, name)] = (job, name)
+        except Exception as exc:
+            _finish(job, ImageJob.FAILED, repr(exc))
+    for future in as_completed(pending):
+        job, name = pending[future]
+        _complete(job, name, future.result)
+    return len(jobs)
+
+
+def _complete(job, name, result):
+    try:
+        _store(job, name, result())
+    except Exception as exc:
+        _finish(job, ImageJob.FAILED, repr(exc))
+    else:
+        _finish(job, ImageJob.DONE)
+
+
+def executor(workers):
+    if not workers:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
@@ -0,0 +1,32 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('imaging/responsive_image.html')
+def responsive_image(instance, css_class='', sizes='100vw', alt=''):
+    """Render a lazy <img> with a srcset per format, falling back to the original.
+
+    Stored dimensions reserve the image's box and its placeholder colour
+    fills it until the file arrives.
+    """
+    field_file, derivatives = instance.image, instance.derivatives
+    storage = field_file.storage
+    by_type = {}
+    if (derivatives or {}).get('source') != field_file.name:
+        #not generated yet for this upload, serve the original until the worker catches up
+        derivatives = {}
+    for image in (derivatives or {}).get('images', []):
+        by_type.setdefault(image['type'], []).append('%s %dw' % (storage.url(image['name']), image['width']))
+    fallback = by_type.pop('image/jpeg', [])
+    return {
+        'src': field_file.url,
+        'srcset': ', '.join(fallback),
+        'sources': [{'type': mime, 'srcset': ', '.join(srcset)} for mime, srcset in by_type.items()],
+        'css_class': css_class,
+        'sizes': sizes,
+        'alt': alt,
+        'width': instance.width,
+        'height': instance.height,
+        'color': instance.placeholder_color,
+    }
@@ -0,0 +1,106 @@
+import io
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.shortcuts import reverse
+from django.test import TestCase
+from PIL import Image
+from imaging import queue
+from imaging.models import ImageJob
+from pictures.models import Picture
+from sponsors.models import Sponsors
+from pictures.tests.factories import PictureFactory
+from sponsors.tests.factories import SponsorFactory
+from core.tests.media import TemporaryMediaMixin
+
+def built(instance):
+    """runs the queued image jobs in this process and reloads ``instance``"""
+    queue.run_batch()
+    instance.refresh_from_db()
+    return instance
+
+class DerivativesTest(TemporaryMediaMixin, TestCase):
+    def test_builtonupload(self):
+        """an uploaded picture gets one derivative per width, never upscaled"""
+        picture = built(PictureFactory(image__width=1000, image__height=500))
+        self.assertEqual(picture.derivatives["source"], picture.image.name)
+        jpegs = [d for d in picture.derivatives["images"] if d["format"] == "JPEG"]
+        self.assertEqual([(d["width"], d["height"]) for d in jpegs], [(320, 160), (640, 320), (1000, 500)])
+        for d in picture.derivatives["images"]:
+            self.assertTrue(default_storage.exists(d["name"]))
+
+    def test_smallimage(self):
+        sponsor = built(SponsorFactory(image__width=100, image__height=80))
+        self.assertEqual({(d["width"], d["height"]) for d in sponsor.derivatives["images"]}, {(100, 80)})
+
+    def test_transparentpng(self):
+        buffer = io.BytesIO()
+        Image.new("RGBA", (400, 400), (255, 0, 0, 0)).save(buffer, "PNG")
+        picture = Picture(description="logo")
+        picture.image.save("logo.png", ContentFile(buffer.getvalue()))
+        built(picture)
+        self.assertTrue(picture.derivatives["images"])
+
+    def test_notrebuiltonresave(self):
+        picture = built(PictureFactory())
+        picture.description = "changed"
+        picture.save()
+        self.assertFalse(ImageJob.objects.filter(status=ImageJob.PENDING).exists())
+
+    def test_deletedwithpicture(self):
+        picture = built(PictureFactory())
+        names = [d["name"] for d in picture.derivatives["images"]]
+        picture.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+
+    def test_command(self):
+        picture = PictureFactory()
+        Picture.objects.filter(pk=picture.pk).update(derivatives={})
+        call_command("build_derivatives", stdout=io.StringIO())
+        picture.refresh_from_db()
+        self.assertEqual(picture.derivatives["source"], picture.image.name)
+
+    def test_srcset(self):
+        cache.clear()
+        picture = built(PictureFactory(image__width=700, image__height=500))
+        content = self.client.get(reverse("pictures_page")).content.decode("utf-8")
+        self.assertIn('src="%s"' % picture.image.url, content)
+        self.assertIn("320w", content)
+        self.assertIn('sizes="700px"', content)
+
+class ImageMetadataTest(TemporaryMediaMixin, TestCase):
+    def test_dimensionsonupload(self):
+        """dimensions are read from the header when a new file is saved"""
+        picture = PictureFactory(image__width=300, image__height=200)
+        self.assertEqual((picture.width, picture.height), (300, 200))
+
+    def test_placeholdercolor(self):
+        picture = built(PictureFactory(image__color="red"))
+        self.assertEqual(picture.placeholder_color, "#fe0000")
+
+    def test_lazyimg(self):
+        cache.clear()
+        picture = built(PictureFactory(image__width=300, image__height=200, image__color="blue"))
+        content = self.client.get(reverse("pictures_page")).content.decode("utf-8")
+        self.assertIn('width="300" height="200"', content)
+        self.assertIn('loading="lazy"', content)
+        self.assertIn("background-color: %s" % picture.placeholder_color, content)
+
+    def test_backfill(self):
+        sponsor = SponsorFactory(image__width=120, image__height=60, image__color="green")
+        Sponsors.objects.update(width=None, height=None, placeholder_color="")
+        call_command("backfill_image_metadata", stdout=io.StringIO())
+        sponsor.refresh_from_db()
+        self.assertEqual((sponsor.width, sponsor.height), (120, 60))
+        self.assertTrue(sponsor.placeholder_color.startswith("#"))
+
+    def test_missingfile(self):
+        """a row whose file is gone still loads and the backfill skips it"""
+        picture = PictureFactory()
+        Picture.objects.update(width=None, height=None)
+        default_storage.delete(picture.image.name)
+        self.assertEqual(list(Picture.objects.all()), [picture])
+        err = io.StringIO()
+        call_command("backfill_image_metadata", stdout=io.StringIO(), stderr=err)
+        self.assertIn("Picture %d" % picture.pk, err.getvalue())
@@ -0,0 +1,62 @@
+from io import StringIO
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase
+from django.utils.timezone import now, timedelta
+from imaging import queue
+from imaging.models import ImageJob
+from pictures.models import Picture
+from pictures.tests.factories import PictureFactory
+from core.tests.media import TemporaryMediaMixin
+
+class ImageQueueTest(TemporaryMediaMixin, TestCase):
+    def test_uploadqueues(self):
+        """saving a new upload queues a job instead of resizing in the request"""
+        picture = PictureFactory()
+        self.assertEqual(picture.derivatives, {})
+        job = ImageJob.objects.get()
+        self.assertEqual((job.target, job.status), (picture, ImageJob.PENDING))
+
+    def test_onependingjobperimage(self):
+        picture = PictureFactory()
+        picture.save()
+        self.assertEqual(ImageJob.objects.count(), 1)
+
+    def test_worker_pool(self):
+        """the worker renders in a process pool and records the result"""
+        pictures = [PictureFactory(image__width=400, image__height=300) for i in range(3)]
+        call_command("process_image_jobs", "--once", "--workers", "2", stdout=StringIO())
+        self.assertEqual(set(ImageJob.objects.values_list("status", flat=True)), {ImageJob.DONE})
+        for picture in pictures:
+            picture.refresh_from_db()
+            self.assertEqual(picture.derivatives["source"], picture.image.name)
+
+    def test_deletedtarget(self):
+        picture = PictureFactory()
+        Picture.objects.filter(pk=picture.pk).delete()
+        queue.run_batch()
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.DONE)
+
+    def test_failure_retries(self):
+        """a broken image is retried up to the attempt limit, then marked failed"""
+        picture = PictureFactory()
+        with picture.image.open("wb") as f:
+            f.write(b"not an image")
+        for i in range(3):
+            queue.run_batch()
+        job = ImageJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (ImageJob.FAILED, 3))
+        self.assertTrue(job.error)
+
+    def test_requeue_stale(self):
+        PictureFactory()
+        ImageJob.objects.update(status=ImageJob.RUNNING, updated_at=now() - timedelta(hours=1))
+        self.assertEqual(queue.requeue_stale(30), 1)
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.PENDING)
+
+    def test_template_fallsback(self):
+        """a page rendered before the worker runs shows the original"""
+        picture = PictureFactory()
+        html = Template("{% load imaging %}{% responsive_image p %}").render(Context({"p": picture}))
+        self.assertIn('src="%s"' % picture.image.url, html)
+        self.assertNotIn("srcset", html)
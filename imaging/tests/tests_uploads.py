@@ -0,0 +1,86 @@
+import hashlib
+import io
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+from PIL import Image
+from imaging.uploads import validate_image_pixels
+from pictures.models import Picture
+from core.tests.media import TemporaryMediaMixin
+
+def jpeg(width=40, height=30):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+class ContentAddressedTest(TemporaryMediaMixin, TestCase):
+    def test_storedbyhash(self):
+        """an image is stored under the sha256 of its bytes, not its upload name"""
+        data = jpeg()
+        picture = Picture(description="photo")
+        picture.image.save("My Holiday.JPG", ContentFile(data))
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertRegex(picture.image.name, r"^pictures/%s/%s\.jpg$" % (digest[:2], digest))
+        self.assertEqual(picture.content_hash, digest)
+
+class UploadTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+    def upload(self, data):
+        return self.client.post(reverse("admin:pictures_picture_add"), {
+            "description": "upload",
+            "image": SimpleUploadedFile("upload.jpg", data, content_type="image/jpeg"),
+        })
+
+    def test_streamed(self):
+        """an admin upload is streamed, hashed on arrival and stored by hash"""
+        data = jpeg()
+        self.assertEqual(self.upload(data).status_code, 302)
+        picture = Picture.objects.get()
+        self.assertEqual(picture.content_hash, hashlib.sha256(data).hexdigest())
+        self.assertIn(picture.content_hash, picture.image.name)
+        self.assertEqual((picture.width, picture.height), (40, 30))
+
+    def test_change_without_upload(self):
+        """saving an existing picture does not reread or revalidate its stored image"""
+        self.upload(jpeg())
+        picture = Picture.objects.get()
+        picture.image.storage.delete(picture.image.name)
+        response = self.client.post(reverse("admin:pictures_picture_change", args=[picture.pk]),
+                                    {"description": "renamed"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Picture.objects.get().description, "renamed")
+
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES=200)
+    def test_toolarge(self):
+        """bytes past the limit are dropped and the form reports the size"""
+        response = self.upload(jpeg())
+        self.assertContains(response, "Images can be at most 200")
+        self.assertFalse(Picture.objects.exists())
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=1000)
+    def test_toomanypixels(self):
+        response = self.upload(jpeg())
+        self.assertContains(response, "megapixels")
+        self.assertFalse(Picture.objects.exists())
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=1000)
+    def test_pixelsfromheader(self):
+        """the pixel count is read from the header without decoding the image"""
+        upload = ContentFile(jpeg(4000, 3000))
+        with mock.patch.object(Image.Image, "load", side_effect=AssertionError("decoded")):
+            with self.assertRaises(ValidationError):
+                validate_image_pixels(upload)
+
+    def test_decompressionbomb(self):
+        """images too large for Pillow to size are rejected as too many pixels"""
+        with mock.patch.object(Image, "open", side_effect=Image.DecompressionBombError("bomb")):
+            with self.assertRaisesMessage(ValidationError, "far more"):
+                validate_image_pixels(ContentFile(jpeg()))
@@ -0,0 +1,136 @@
+import hashlib
+import os
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from django.db import models
+from django.db.models.fields.files import ImageFieldFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+from imaging.hashing import content_hash
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    """Write each uploaded file to a temporary file, hashing it on the way.
+
+    Nothing but the current chunk is held in memory, whatever the upload
+    size. Past ``IMAGE_UPLOAD_MAX_BYTES`` the rest of the file is
+    discarded and an empty placeholder carrying the full size is returned,
+    so the form can report the limit instead of a missing file.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset,
+                                          self.content_type_extra)
+        self.digest = hashlib.sha256()
+        self.oversized = False
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.IMAGE_UPLOAD_MAX_BYTES:
+            if not self.oversized:
+                self.file.close()
+                self.oversized = True
+            return None
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.oversized:
+            return UploadedFile(name=self.file_name, content_type=self.content_type, size=file_size)
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.content_hash = self.digest.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file') and not self.oversized:
+            self.file.close()
+
+
+def _stored(file):
+    #a FieldFile already saved was checked on upload; reading it again would
+    #open the stored file on every change form save, or fail if it is gone
+    return getattr(file, '_committed', False)
+
+
+def validate_image_size(file):
+    if _stored(file):
+        return
+    if file.size > settings.IMAGE_UPLOAD_MAX_BYTES:
+        raise ValidationError('Images can be at most %(limit)s; this one is %(size)s.', code='file_size',
+                              params={'limit': filesizeformat(settings.IMAGE_UPLOAD_MAX_BYTES),
+                                      'size': filesizeformat(file.size)})
+
+
+def validate_image_pixels(file):
+    """Reject images with more than ``IMAGE_UPLOAD_MAX_PIXELS`` pixels.
+
+    ``Image.open`` only parses the header, so this never allocates the
+    decoded image a derivative job would.
+    """
+    if _stored(file):
+        return
+    limit = {'limit': settings.IMAGE_UPLOAD_MAX_PIXELS / 1e6}
+    try:
+        file.seek(0)
+        width, height = Image.open(file).size
+        file.seek(0)
+    except Image.DecompressionBombError:
+        #Pillow refuses to even report the size of these
+        raise ValidationError('Images can have at most %(limit).0f megapixels; this one has far more.',
+                              code='pixels', params=limit)
+    except OSError:
+        #not an image at all, or an unreadable file, which ImageField reports itself
+        return
+    if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+        raise ValidationError('Images can have at most %(limit).0f megapixels; this one has %(pixels).0f.',
+                              code='pixels', params=dict(limit, pixels=width * height / 1e6))
+
+
+def store_dimensions(instance, field='image'):
+    """Copy a newly assigned image's size to ``width`` and ``height``.
+
+    Only a new file's header is read; loading rows never opens their files.
+    """
+    field_file = getattr(instance, field)
+    if field_file and not field_file._committed:
+        instance.width, instance.height = field_file.width, field_file.height
+
+
+class UploadImageFormField(forms.ImageField):
+    def to_python(self, data):
+        #before Pillow reads anything, an oversized upload is only an empty placeholder
+        if isinstance(data, UploadedFile):
+            validate_image_size(data)
+        return super().to_python(data)
+
+
+class ContentAddressedFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):
+        #files streamed by StreamingUploadHandler were hashed as they arrived
+        digest = getattr(content, 'content_hash', None)
+        if digest is None:
+            content.seek(0)
+            digest = content_hash(content.chunks())
+            content.seek(0)
+        name = '%s/%s%s' % (digest[:2], digest, os.path.splitext(name)[1].lower())
+        super().save(name, content, save)
+
+
+class UploadImageField(models.ImageField):
+    """An ImageField with upload limits that stores files under their sha256.
+
+    Names no longer depend on what the uploader called the file; the
+    storage still adds its usual suffix when the same bytes arrive twice.
+    """
+    attr_class = ContentAddressedFieldFile
+    default_validators = [validate_image_size, validate_image_pixels]
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{'form_class': UploadImageFormField, **kwargs})
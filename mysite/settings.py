@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 
 import os
 
+from core.db import database_from_env
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -40,10 +42,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'core.apps.CoreConfig',
+    'imaging.apps.ImagingConfig',
     'blog.apps.BlogConfig',
     'pictures.apps.PicturesConfig',
     'homepage.apps.HomepageConfig',
     'sponsors.apps.SponsorsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
@@ -56,14 +61,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in request timing: Server-Timing headers and a per-view histogram at
+# admin/performance/ covering the last PERFORMANCE_WINDOW requests.
+PERFORMANCE_MONITORING = os.environ.get('PERFORMANCE_MONITORING') == 'True'
+PERFORMANCE_APPS = ['blog', 'pictures', 'sponsors', 'homepage', 'api']
+PERFORMANCE_WINDOW = 500
+
+if PERFORMANCE_MONITORING:
+    MIDDLEWARE.insert(0, 'core.performance.PerformanceMiddleware')
+
 ROOT_URLCONF = 'mysite.urls'
 
+_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        #the timed backend feeds template time to the performance middleware
+        'BACKEND': ('core.performance.TimedDjangoTemplates' if PERFORMANCE_MONITORING
+                    else 'django.template.backends.django.DjangoTemplates'),
         'DIRS': [os.path.join(BASE_DIR, 'mysite', 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            #parse each template once per process outside development
+            'loaders': _loaders if DEBUG else [
+                ('django.template.loaders.cached.Loader', _loaders),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -80,13 +104,61 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
+# Configured from DB_PROFILE / DATABASE_URL, see core.db.database_from_env
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    'default': database_from_env(BASE_DIR),
+}
+
+# Applied to each new SQLite connection. WAL lets readers run while the
+# admin writes; NORMAL sync is safe under WAL. The busy timeout is not set
+# here: the connection's timeout (SQLITE_BUSY_TIMEOUT) already is one.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -20000,
+    'mmap_size': 134217728,
+    'temp_store': 'memory',
+}
+
+
+# Caching
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# locmem is per process, so with several web workers use the file backend
+# to make signal invalidation visible to all of them.
+
+if os.environ.get('CACHE_BACKEND', 'locmem') == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')),
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'changethenarrative',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
     }
+
+# {% cache %} fragments (the header nav) only change on deploy, which
+# restarts the workers and empties this per-process cache.
+CACHES['template_fragments'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'template_fragments',
+    'TIMEOUT': None,
 }
 
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+# The public pages are async under ASGI (mysite.asgi sets this) and sync under
+# WSGI, which would otherwise pay for async_to_sync and a thread hop per query
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == 'True'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -127,5 +199,51 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
+# collectstatic fingerprints file names and writes .gz/.br siblings, so the
+# front server can send /static/ with far-future Cache-Control headers.
+# Running collectstatic is a required deploy step. Until it has run, pages
+# link the plain, uncompressed files and the core.W001 check warns.
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.staticfiles.BundledManifestStorage'
+
+# Minified into one file at collectstatic time, linked with {% css_bundle %}
+STATIC_BUNDLES = {
+    'css/site.css': ['css/root.css', 'css/pic.css', 'css/sponsors.css'],
+}
+
+# Output of the export_site command, served directly by the front web server
+STATIC_EXPORT_ROOT = os.path.join(BASE_DIR, 'export')
+
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
-MEDIA_URL = "/media/"
\ No newline at end of file
+MEDIA_URL = "/media/"
+
+# Resized copies of uploaded pictures and sponsor logos, emitted as srcset
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+IMAGE_DERIVATIVE_QUALITY = 80
+IMAGE_JOB_BATCH_SIZE = 20
+IMAGE_JOB_MAX_ATTEMPTS = 3
+
+# Uploads stream to temporary files and are stored under their sha256;
+# anything larger is rejected before Pillow decodes it
+FILE_UPLOAD_HANDLERS = ['imaging.uploads.StreamingUploadHandler']
+IMAGE_UPLOAD_MAX_BYTES = 20 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = 40 * 1000 * 1000
+
+
+# Blog
+
+BLOG_POSTS_PER_PAGE = 10
+BLOG_EXCERPT_LENGTH = 300
+BLOG_FEED_SIZE = 20
+
+
+# API
+# ?limit= is capped at API_MAX_PAGE_SIZE, ?ids= takes at most API_MAX_IDS
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_MAX_IDS = 100
+
+# Pictures
+
+PICTURES_PER_PAGE = 24
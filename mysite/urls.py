@@ -16,13 +16,16 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
+from core.views import performance_report
 
 urlpatterns = [
+    path('admin/performance/', performance_report, name='performance_report'),
     path('admin/', admin.site.urls),
     path('', include('homepage.urls')),
     path('blog/', include('blog.urls')),
     path('pictures/', include('pictures.urls')),
     path('sponsors/', include('sponsors.urls')),
+    path('api/', include('api.urls')),
 ]
 
 if settings.DEBUG:
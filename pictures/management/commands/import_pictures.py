@@ -0,0 +1,128 @@
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from PIL import Image
+
+from core.cache import invalidate
+from imaging import queue
+from imaging.hashing import content_hash, perceptual_hash
+from pictures.models import Picture
+
+EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.tif', '.tiff', '.bmp')
+
+
+def inspect(path):
+    """Hash and fully decode one file; runs in a worker process."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        image = Image.open(io.BytesIO(data))
+        image.verify()
+        #verify() leaves the image unusable and misses truncated data, so decode a fresh copy
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return {
+            'path': path,
+            'size': len(data),
+            'width': image.width,
+            'height': image.height,
+            'content_hash': content_hash([data]),
+            'phash': perceptual_hash(image),
+        }
+    except Exception as exc:
+        return {'path': path, 'error': '%s: %s' % (type(exc).__name__, exc)}
+
+
+class Command(BaseCommand):
+    help = 'Import a directory of photos as pictures, skipping duplicates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Decoding processes; 0 decodes in this process')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--description', default='',
+                            help='Description for every picture; defaults to the file name')
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError('%s is not a directory' % directory)
+        paths = sorted(
+            os.path.join(root, name)
+            for root, dirs, files in os.walk(directory)
+            for name in files
+            if name.lower().endswith(EXTENSIONS)
+        )
+        #rows committed by an earlier, interrupted run are skipped like any other duplicate
+        self.seen = set(Picture.objects.exclude(content_hash='').values_list('content_hash', flat=True))
+        self.seen_phash = set(Picture.objects.exclude(phash='').values_list('phash', flat=True))
+        self.options = options
+        self.stats = {'imported': 0, 'duplicates': 0, 'errors': 0, 'bytes': 0}
+        self.started = time.monotonic()
+
+        workers = options['workers']
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                self.consume(executor.map(inspect, paths, chunksize=8))
+        else:
+            self.consume(map(inspect, paths))
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            'Scanned %d files in %.1fs: %d imported, %d duplicates, %d errors (%.1f files/s, %.1f MB/s)' % (
+                len(paths), elapsed, self.stats['imported'], self.stats['duplicates'], self.stats['errors'],
+                len(paths) / elapsed if elapsed else 0, self.stats['bytes'] / 1e6 / elapsed if elapsed else 0)))
+
+    def consume(self, results):
+        batch = []
+        for result in results:
+            if 'error' in result:
+                self.stats['errors'] += 1
+                self.stderr.write('Skipping %s: %s' % (result['path'], result['error']))
+                continue
+            self.stats['bytes'] += result['size']
+            if result['content_hash'] in self.seen or result['phash'] in self.seen_phash:
+                self.stats['duplicates'] += 1
+                continue
+            self.seen.add(result['content_hash'])
+            self.seen_phash.add(result['phash'])
+            batch.append(result)
+            if len(batch) >= self.options['batch_size']:
+                self.flush(batch)
+        self.flush(batch)
+
+    def flush(self, batch):
+        if not batch:
+            return
+        pictures = []
+        try:
+            for result in batch:
+                description = self.options['description'] or os.path.splitext(os.path.basename(result['path']))[0]
+                picture = Picture(description=description, content_hash=result['content_hash'], phash=result['phash'],
+                                  width=result['width'], height=result['height'])
+                with open(result['path'], 'rb') as f:
+                    content = File(f)
+                    #the worker already hashed the bytes, so the storage name needs no second read
+                    content.content_hash = result['content_hash']
+                    picture.image.save(os.path.basename(result['path']), content, save=False)
+                pictures.append(picture)
+            with transaction.atomic():
+                Picture.objects.bulk_create(pictures)
+                pks = Picture.objects.filter(
+                    content_hash__in=[p.content_hash for p in pictures]).values_list('pk', flat=True)
+                queue.enqueue_many(Picture, pks)
+        except Exception:
+            for picture in pictures:
+                picture.image.storage.delete(picture.image.name)
+            raise
+        invalidate('pictures')
+        self.stats['imported'] += len(batch)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write('Imported %d pictures (%.1f/s)' % (self.stats['imported'], self.stats['imported'] / elapsed))
+        batch.clear()
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0002_picture_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0003_picture_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='phash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0004_picture_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='placeholder_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='picture',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='picture',
+            name='image',
+            field=models.ImageField(height_field='height', upload_to='pictures/', width_field='width'),
+        ),
+    ]
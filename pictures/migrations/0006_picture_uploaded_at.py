@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0005_picture_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='picture',
+            name='uploaded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='picture',
+            index=models.Index(fields=['uploaded_at', 'id'], name='pictures_uploaded_idx'),
+        ),
+    ]
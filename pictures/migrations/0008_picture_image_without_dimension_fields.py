@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:04
+
+from django.db import migrations
+import imaging.uploads
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pictures', '0007_picture_content_addressed_image'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='picture',
+            name='image',
+            field=imaging.uploads.UploadImageField(upload_to='pictures/'),
+        ),
+    ]
@@ -1,9 +1,34 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from imaging.hashing import file_hash
+from imaging.uploads import UploadImageField, store_dimensions
 
 class Picture(models.Model):
     description = models.TextField()
-    image = models.ImageField(upload_to="pictures/")
+    image = UploadImageField(upload_to="pictures/")
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    placeholder_color = models.CharField(max_length=7, blank=True, editable=False)
+    uploaded_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    #sha256 of the uploaded file and a perceptual hash, used to skip duplicates
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+    phash = models.CharField(max_length=16, blank=True, db_index=True, editable=False)
+
+    class Meta:
+        indexes = [
+            #keyset pagination of the gallery walks (uploaded_at, id)
+            models.Index(fields=['uploaded_at', 'id'], name='pictures_uploaded_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        store_dimensions(self)
+        if self.image and (not self.image._committed or not self.content_hash):
+            self.content_hash = file_hash(self.image)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.description
\ No newline at end of file
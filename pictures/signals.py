@@ -0,0 +1,6 @@
+from core.cache import invalidate_on_change
+from imaging import queue
+from .models import Picture
+
+invalidate_on_change(Picture, 'pictures')
+queue.track(Picture)
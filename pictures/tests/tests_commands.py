@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.files import File
+from django.core.management import call_command
+from django.test import TestCase
+from PIL import Image
+from imaging.models import ImageJob
+from pictures.models import Picture
+from core.tests.media import TemporaryMediaMixin
+
+class ImportPicturesTest(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        gradient = Image.linear_gradient("L").convert("RGB")
+        gradient.save(os.path.join(self.directory, "a.jpg"), quality=90)
+        shutil.copy(os.path.join(self.directory, "a.jpg"), os.path.join(self.directory, "a copy.jpg"))
+        #same photo re-encoded smaller: different bytes, same perceptual hash
+        gradient.resize((128, 128)).save(os.path.join(self.directory, "a small.png"))
+        os.mkdir(os.path.join(self.directory, "event"))
+        Image.radial_gradient("L").save(os.path.join(self.directory, "event", "b.png"))
+        with open(os.path.join(self.directory, "broken.jpg"), "wb") as f:
+            f.write(b"not an image")
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_pictures", self.directory, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import(self):
+        """distinct images are imported once, duplicates and broken files are skipped"""
+        out, err = self.run_import("--workers", "0", "--batch-size", "1")
+        self.assertEqual(Picture.objects.count(), 2)
+        self.assertEqual(set(Picture.objects.values_list("description", flat=True)), {"a copy", "b"})
+        self.assertIn("2 imported, 2 duplicates, 1 errors", out)
+        self.assertIn("broken.jpg", err)
+        self.assertEqual(ImageJob.objects.count(), 2)
+        for picture in Picture.objects.all():
+            self.assertEqual(len(picture.content_hash), 64)
+            self.assertEqual(len(picture.phash), 16)
+
+    def test_hashed_once(self):
+        """the worker's hash names the stored file, which is not read again"""
+        with mock.patch("imaging.uploads.content_hash", side_effect=AssertionError("hashed twice")):
+            self.run_import("--workers", "0")
+        for picture in Picture.objects.all():
+            self.assertIn(picture.content_hash, picture.image.name)
+
+    def test_resume(self):
+        """running again after an interruption imports only what is missing"""
+        os.rename(os.path.join(self.directory, "event", "b.png"), os.path.join(self.directory, "b.png.later"))
+        self.run_import("--workers", "0")
+        os.rename(os.path.join(self.directory, "b.png.later"), os.path.join(self.directory, "event", "b.png"))
+        out, err = self.run_import("--workers", "2")
+        self.assertIn("1 imported", out)
+        self.assertEqual(Picture.objects.count(), 2)
+
+    def test_uploadhashed(self):
+        """pictures added through the admin are hashed too, so imports skip them"""
+        picture = Picture(description="admin")
+        with open(os.path.join(self.directory, "a.jpg"), "rb") as f:
+            picture.image.save("a.jpg", File(f))
+        self.run_import("--workers", "0")
+        self.assertFalse(Picture.objects.filter(description__in=["a", "a copy"]).exists())
@@ -1,10 +1,13 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.shortcuts import reverse
 from pictures.tests.factories import PictureFactory
+from core.tests.media import TemporaryMediaMixin
 
-class PicturesTest(TestCase):
+class PicturesTest(TemporaryMediaMixin, TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("pictures_page")
 
     def test_nopictures(self):
@@ -19,4 +22,15 @@ class PicturesTest(TestCase):
         picture2 = PictureFactory()
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(list(response.context["pictures"]), [picture1, picture2])
\ No newline at end of file
+        self.assertEqual(list(response.context["pictures"]), [picture1, picture2])
+
+    @override_settings(PICTURES_PER_PAGE=2)
+    def test_paginates(self):
+        """a page holds a fixed number of pictures and links to the next one"""
+        pictures = [PictureFactory() for i in range(3)]
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(list(response.context["pictures"]), pictures[:2])
+        response = self.client.get(self.url, {"after": response.context["next_cursor"]})
+        self.assertEqual(list(response.context["pictures"]), pictures[2:])
+        self.assertIsNone(response.context["next_cursor"])
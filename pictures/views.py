@@ -1,8 +1,26 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.shortcuts import redirect
+from django.http import Http404
+from django.conf import settings
+from core.cache import cache_public_page
+from core.conditional import conditional_page, namespace_validators
+from core.pagination import keyset_page, InvalidCursor
+from core.views import public_page
 from .models import Picture
 
-def pictures_page (request):
-    pictures = Picture.objects.all()
-    return render(request, 'pictures/pictures_page.html', {'pictures': pictures}) 
\ No newline at end of file
+_pictures_validators = namespace_validators('pictures')
+
+def _page(request):
+    try:
+        return keyset_page(Picture.objects.all(), request.GET.get('after'),
+                           settings.PICTURES_PER_PAGE, ('uploaded_at', 'pk'))
+    except InvalidCursor:
+        raise Http404()
+
+@conditional_page(_pictures_validators)
+@cache_public_page('pictures')
+@public_page('pictures/pictures_page.html')
+def pictures_page(request):
+    pictures, next_cursor = _page(request)
+    return {'pictures': pictures, 'next_cursor': next_cursor}
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SponsorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sponsors'
+
+    def ready(self):
+        from . import signals
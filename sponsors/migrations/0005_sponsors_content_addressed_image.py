@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:50
+
+from django.db import migrations
+import imaging.uploads
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sponsors', '0004_sponsors_dimensions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sponsors',
+            name='image',
+            field=imaging.uploads.UploadImageField(height_field='height', upload_to='sponsors/', width_field='width'),
+        ),
+    ]
@@ -1,9 +1,20 @@
 from django.conf import settings
 from django.db import models
 
+from imaging.uploads import UploadImageField, store_dimensions
+
 class Sponsors(models.Model):
     description = models.TextField()
-    image = models.ImageField(upload_to="sponsors/")
+    image = UploadImageField(upload_to="sponsors/")
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    placeholder_color = models.CharField(max_length=7, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        store_dimensions(self)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.description
\ No newline at end of file
@@ -0,0 +1,6 @@
+from core.cache import invalidate_on_change
+from imaging import queue
+from .models import Sponsors
+
+invalidate_on_change(Sponsors, 'sponsors')
+queue.track(Sponsors)
@@ -1,10 +1,13 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.shortcuts import reverse
 from .factories import SponsorFactory
+from core.tests.media import TemporaryMediaMixin
 
-class SponsorsTest(TestCase):
+class SponsorsTest(TemporaryMediaMixin, TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("sponsors_page")
 
     def test_nosponsors(self):
@@ -1,8 +1,15 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.shortcuts import redirect
+from core.cache import cache_public_page
+from core.conditional import conditional_page, namespace_validators
+from core.views import public_page
 from .models import Sponsors
 
-def sponsors_page (request):
-    sponsors = Sponsors.objects.all()
-    return render(request, 'sponsors/sponsors_page.html', {'sponsors': sponsors}) 
\ No newline at end of file
+_sponsors_validators = namespace_validators('sponsors')
+
+@conditional_page(_sponsors_validators)
+@cache_public_page('sponsors')
+@public_page('sponsors/sponsors_page.html')
+def sponsors_page(request):
+    return {'sponsors': list(Sponsors.objects.all())}